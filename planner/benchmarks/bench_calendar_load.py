@@ -0,0 +1,71 @@
+"""Compare calendar load times with strptime and with the timestamp codec.
+
+Run from the planner directory:
+
+    python -m benchmarks.bench_calendar_load
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from my_calendar.timecodec import parse_timestamp, format_timestamp  # noqa: E402
+
+SIZES = (10_000, 100_000)
+
+def make_calendar(count):
+    start = datetime(2024, 1, 1, 8, 0, 0, 123456)
+    events = []
+    for i in range(count):
+        event_start = start + timedelta(minutes=37 * i)
+        events.append({
+            "title": f"event {i}",
+            "start_time": format_timestamp(event_start),
+            "end_time": format_timestamp(event_start + timedelta(minutes=30)),
+            "recurrence": "none",
+            "completed": False,
+        })
+    return events
+
+def load_with_strptime(path):
+    with open(path, 'r') as f:
+        calendar_data = json.load(f)
+    for event in calendar_data:
+        event["start_time"] = datetime.strptime(event["start_time"], "%Y-%m-%d %H:%M:%S.%f")
+        event["end_time"] = datetime.strptime(event["end_time"], "%Y-%m-%d %H:%M:%S.%f")
+    return calendar_data
+
+def load_with_codec(path):
+    with open(path, 'r') as f:
+        calendar_data = json.load(f)
+    for event in calendar_data:
+        event["start_time"] = parse_timestamp(event["start_time"])
+        event["end_time"] = parse_timestamp(event["end_time"])
+    return calendar_data
+
+def best_of(func, path, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(path)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'events':>8}  {'strptime':>10}  {'codec':>10}  {'speedup':>7}")
+        for count in SIZES:
+            path = os.path.join(tmp, f"calendar_{count}.json")
+            with open(path, 'w') as f:
+                json.dump(make_calendar(count), f)
+            assert load_with_strptime(path) == load_with_codec(path)
+            before = best_of(load_with_strptime, path)
+            after = best_of(load_with_codec, path)
+            print(f"{count:>8}  {before * 1000:>8.1f}ms  {after * 1000:>8.1f}ms  {before / after:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
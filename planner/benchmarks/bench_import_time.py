@@ -0,0 +1,89 @@
+"""Measure how long `import main` takes in a fresh interpreter, using -X importtime,
+and how long `python main.py` takes to show its first menu prompt.
+
+Run from the planner directory:
+
+    python -m benchmarks.bench_import_time
+
+Exits with status 1 if the median cold start is over IMPORT_BUDGET_MS or the
+median time to the first prompt is over FIRST_PROMPT_BUDGET_MS.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PLANNER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = 250
+FIRST_PROMPT_BUDGET_MS = 400
+PROMPT = b"Enter your choice"
+RUNS = 5
+TOP = 10
+
+def import_times(module="main"):
+    """Import module in a new interpreter; return {imported module: (self us, cumulative us)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PLANNER_DIR, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+def parse_importtime(output):
+    """Turn -X importtime output into {imported module: (self us, cumulative us)}."""
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+def first_prompt_time():
+    """Start the menus in a new interpreter and answer "exit".
+
+    Returns the milliseconds until the first prompt was shown and the
+    modules imported during the run, which ends right after that prompt.
+    """
+    with tempfile.TemporaryFile() as errors:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-X", "importtime", "main.py"],
+            cwd=PLANNER_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=errors,
+        )
+        shown = b""
+        while PROMPT not in shown:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("main.py exited before its first prompt")
+            shown += chunk
+        elapsed = (time.perf_counter() - started) * 1000
+        process.communicate(b"exit\n")
+        errors.seek(0)
+        return elapsed, parse_importtime(errors.read().decode())
+
+def main():
+    runs = [import_times() for _ in range(RUNS)]
+    totals = [run["main"][1] / 1000 for run in runs]
+    median = statistics.median(totals)
+
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1][1], reverse=True)[:TOP]
+    print(f"{'cumulative':>10}  {'self':>8}  module")
+    for name, (own, cumulative) in slowest:
+        print(f"{cumulative / 1000:>8.1f}ms  {own / 1000:>6.1f}ms  {name}")
+    print()
+    print(f"import main: median {median:.1f}ms over {RUNS} runs (min {min(totals):.1f}ms, budget {IMPORT_BUDGET_MS}ms)")
+
+    prompts = [first_prompt_time() for _ in range(RUNS)]
+    prompt_median = statistics.median(elapsed for elapsed, _ in prompts)
+    sections = sorted(name for name in prompts[-1][1] if name.split(".")[0] in ("my_calendar", "deadlines", "tasks", "habits", "students", "notes", "reminders"))
+    print(f"first prompt: median {prompt_median:.1f}ms over {RUNS} runs (min {min(elapsed for elapsed, _ in prompts):.1f}ms, budget {FIRST_PROMPT_BUDGET_MS}ms)")
+    print(f"planner sections loaded by then: {', '.join(sections) or 'none'}")
+
+    if median > IMPORT_BUDGET_MS or prompt_median > FIRST_PROMPT_BUDGET_MS:
+        print("Over budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
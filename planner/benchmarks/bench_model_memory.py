@@ -0,0 +1,63 @@
+"""Compare the memory taken by calendar events held as dicts and as Event records.
+
+Run from the planner directory:
+
+    python -m benchmarks.bench_model_memory
+
+Builds EVENTS events from their stored JSON form both ways and reports the
+bytes allocated per record, measured with tracemalloc, and the decode time.
+"""
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from my_calendar.models import Event
+from my_calendar.timecodec import parse_timestamp, format_timestamp
+from storage import new_id
+
+EVENTS = 100_000
+
+def stored_events(n):
+    """JSON form of n one-hour events, as read from calendar_data.json."""
+    start = datetime(2024, 1, 1, 8)
+    return [
+        {
+            "id": new_id(),
+            "title": f"event {i}",
+            "start_time": format_timestamp(start + timedelta(minutes=30 * i)),
+            "end_time": format_timestamp(start + timedelta(minutes=30 * i + 60)),
+            "recurrence": "none",
+            "completed": False,
+        } for i in range(n)
+    ]
+
+def decode_dict(record):
+    """The dict representation events had before the models: the stored record with parsed times."""
+    event = dict(record)
+    event["start_time"] = parse_timestamp(event["start_time"])
+    event["end_time"] = parse_timestamp(event["end_time"])
+    return event
+
+def measure(decode, records):
+    """Decode every record; return (events, bytes allocated, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    events = [decode(record) for record in records]
+    elapsed = time.perf_counter() - started
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return events, allocated, elapsed
+
+def main():
+    records = stored_events(EVENTS)
+    results = {}
+    for name, decode in (("dict", decode_dict), ("Event", Event.from_dict)):
+        events, allocated, elapsed = measure(decode, records)
+        results[name] = allocated / len(events)
+        print(f"{name:>6}: {allocated / 2**20:7.1f} MiB for {len(events):,} events, {results[name]:6.0f} bytes each, decoded in {elapsed:.2f}s")
+        del events
+    print(f"Event records take {1 - results['Event'] / results['dict']:.0%} less memory than dicts")
+
+if __name__ == "__main__":
+    main()
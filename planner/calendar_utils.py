@@ -1,6 +1,6 @@
 import json
 import os
-from datetime import datetime
+from my_calendar.timecodec import parse_timestamp, format_timestamp
 
 # Global variables
 calendar_data = []
@@ -14,14 +14,9 @@ def load_calendar():
             try:
                 calendar_data = json.load(f)
                 for event in calendar_data:
-                    try:
-                        # Try to parse datetime with microseconds
-                        event["start_time"] = datetime.strptime(event["start_time"], "%Y-%m-%d %H:%M:%S.%f")
-                        event["end_time"] = datetime.strptime(event["end_time"], "%Y-%m-%d %H:%M:%S.%f")
-                    except ValueError:
-                        # Fallback to parsing without microseconds
-                        event["start_time"] = datetime.strptime(event["start_time"], "%Y-%m-%d %H:%M:%S")
-                        event["end_time"] = datetime.strptime(event["end_time"], "%Y-%m-%d %H:%M:%S")
+                    # Handles timestamps with and without microseconds
+                    event["start_time"] = parse_timestamp(event["start_time"])
+                    event["end_time"] = parse_timestamp(event["end_time"])
             except (json.JSONDecodeError, ValueError) as e:
                 print(f"Error loading calendar data: {e}")
                 calendar_data = []
@@ -34,8 +29,8 @@ def save_calendar():
     for event in calendar_data:
         data_to_save.append({
             "title": event["title"],
-            "start_time": event["start_time"].strftime("%Y-%m-%d %H:%M:%S.%f"),
-            "end_time": event["end_time"].strftime("%Y-%m-%d %H:%M:%S.%f"),
+            "start_time": format_timestamp(event["start_time"]),
+            "end_time": format_timestamp(event["end_time"]),
             "recurrence": event["recurrence"]
         })
 
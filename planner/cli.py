@@ -0,0 +1,265 @@
+"""Non-interactive commands for scripting the planner.
+
+Each command loads the datasets it needs once, applies the whole batch and
+saves once at the end. A batch with an invalid entry is rejected as a whole.
+Output is plain text unless --rich is given, which shows the affected table.
+
+    python main.py tasks add --file tasks.csv
+    python main.py tasks add "Read chapter 3" --day monday --time 45
+    python main.py tasks done 0 2
+    python main.py tasks schedule
+    python main.py attendance mark 1 3 4
+    python main.py habits done 0 2 --date 2024-08-14
+    python main.py deadlines add "midterm" 2024-10-02
+    python main.py events import events.ics
+    python main.py events export events.csv
+    python main.py receipts all --month 2024-08
+"""
+import argparse
+import csv
+import sys
+from datetime import date, datetime, timedelta
+from storage import store
+
+class BatchError(Exception):
+    """An entry in a batch is invalid; nothing from the batch is saved."""
+
+def read_rows(path):
+    """Yield (line number, row dict) for a CSV file with a header row."""
+    with open(path, newline='') as f:
+        for number, row in enumerate(csv.DictReader(f), start=2):
+            yield number, {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+
+def parse_date(text):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{text}', expected YYYY-MM-DD")
+
+def parse_month(text):
+    try:
+        month = datetime.strptime(text, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid month '{text}', expected YYYY-MM")
+    return month.year, month.month
+
+def make_task(fields, deadline_names, where):
+    """Build a task record from a dict of fields, raising BatchError if one is invalid."""
+    from tasks.models import Task, DAYS_OF_WEEK
+    title = fields.get("title", "")
+    day = fields.get("day", "").lower()
+    recurrence = fields.get("recurrence", "").lower() or "none"
+    deadline = fields.get("deadline", "")
+    if not title:
+        raise BatchError(f"{where}: missing title")
+    if day and day not in DAYS_OF_WEEK:
+        raise BatchError(f"{where}: invalid day '{day}'")
+    try:
+        time = int(fields.get("time", ""))
+    except ValueError:
+        raise BatchError(f"{where}: time must be a whole number of minutes")
+    if deadline and deadline not in deadline_names:
+        raise BatchError(f"{where}: no deadline named '{deadline}'")
+    return Task(title, day, time, recurrence=recurrence, deadline=deadline or None)
+
+def tasks_add(args):
+    from tasks.tasks import load_tasks, save_tasks, display_tasks
+    from deadlines.deadlines import load_deadlines
+    tasks_data = load_tasks()
+    deadline_names = {deadline.name for deadline in load_deadlines()}
+    if args.file:
+        new_tasks = [make_task(row, deadline_names, f"{args.file}:{number}") for number, row in read_rows(args.file)]
+    elif args.title:
+        fields = {"title": args.title, "day": args.day, "time": args.time, "recurrence": args.recurrence, "deadline": args.deadline}
+        new_tasks = [make_task(fields, deadline_names, "task")]
+    else:
+        raise BatchError("give a task title or --file")
+    tasks_data.extend(new_tasks)
+    save_tasks(tasks_data)
+    print(f"Added {len(new_tasks)} task(s).")
+    return display_tasks if args.rich else None
+
+def tasks_done(args):
+    from tasks.tasks import load_tasks, save_tasks, complete_task, display_tasks
+    tasks_data = load_tasks()
+    ids = sorted(set(args.ids), reverse=True)
+    invalid = [task_id for task_id in ids if not 0 <= task_id < len(tasks_data)]
+    if invalid:
+        raise BatchError(f"invalid task ID(s): {', '.join(map(str, sorted(invalid)))}")
+    # Recurring tasks are re-added at the end, so complete from the highest ID down
+    for task_id in ids:
+        complete_task(tasks_data, task_id)
+    save_tasks(tasks_data)
+    print(f"Marked {len(ids)} task(s) done.")
+    return display_tasks if args.rich else None
+
+def tasks_schedule(args):
+    from tasks.tasks import load_tasks, save_tasks, display_tasks
+    from tasks.scheduler import schedule_all_tasks
+    from my_calendar.my_calendar import load_calendar, save_calendar
+    from deadlines.deadlines import load_deadlines
+    tasks_data = load_tasks()
+    calendar_data = load_calendar()
+    placed, unfit = schedule_all_tasks(tasks_data, calendar_data, load_deadlines())
+    if placed:
+        save_calendar(calendar_data)
+        save_tasks(tasks_data)
+    for task, chunks in placed:
+        for start_time, end_time in chunks:
+            print(f"{task.title}\t{start_time:%Y-%m-%d %H:%M}\t{end_time:%Y-%m-%d %H:%M}")
+    for task in unfit:
+        print(f"Could not fit '{task.title}' ({task.time} min)", file=sys.stderr)
+    print(f"Scheduled {len(placed)} task(s), {len(unfit)} did not fit.")
+    return display_tasks if args.rich else None
+
+def tasks_list(args):
+    from tasks.tasks import load_tasks, display_tasks
+    if args.rich:
+        return display_tasks
+    for i, task in enumerate(load_tasks()):
+        status = "scheduled" if task.scheduled else ("done" if task.done else "not done")
+        print(f"{i}\t{task.title}\t{task.day}\t{task.time}\t{status}")
+    return None
+
+def attendance_mark(args):
+    from students.students import load_students, save_students, load_ledger, save_ledger, display_students
+    students_data = load_students()
+    ledger = load_ledger()
+    ids = [str(student_id) for student_id in args.ids]
+    invalid = [student_id for student_id in ids if student_id not in students_data]
+    if invalid:
+        raise BatchError(f"invalid student ID(s): {', '.join(invalid)}")
+    day = (args.date or date.today()).isoformat()
+    for student_id in ids:
+        ledger.record(student_id, day)
+        students_data[student_id].sessions += 1
+    save_ledger(ledger)
+    save_students()
+    print(f"Marked attendance on {day} for {len(ids)} student(s).")
+    return display_students if args.rich else None
+
+def habits_done(args):
+    from habits.habits import load_habits, save_habits, display_habits
+    from habits.history import mark_done
+    habit_data = load_habits()
+    invalid = [habit_id for habit_id in args.ids if not 0 <= habit_id < len(habit_data)]
+    if invalid:
+        raise BatchError(f"invalid habit ID(s): {', '.join(map(str, invalid))}")
+    day = args.date or date.today()
+    for habit_id in set(args.ids):
+        mark_done(habit_data[habit_id].completion, day)
+    save_habits()
+    print(f"Marked {len(set(args.ids))} habit(s) done on {day.isoformat()}.")
+    return (lambda: display_habits(day)) if args.rich else None
+
+def deadlines_add(args):
+    from bisect import insort
+    from deadlines.deadlines import load_deadlines, save_deadlines, due_key, display_deadlines
+    from deadlines.models import Deadline
+    deadlines = load_deadlines()
+    insort(deadlines, Deadline(args.name, args.due_date), key=due_key)
+    save_deadlines(deadlines)
+    print(f"Added deadline '{args.name}' due {args.due_date.isoformat()}.")
+    return display_deadlines if args.rich else None
+
+def events_import(args):
+    from my_calendar.my_calendar import load_calendar, save_calendar, display_calendar
+    from my_calendar.exchange import ExchangeError, import_events
+    calendar_data = load_calendar()
+    try:
+        count, skipped = import_events(calendar_data, args.file)
+    except ExchangeError as e:
+        raise BatchError(str(e))
+    save_calendar(calendar_data)
+    print(f"Imported {count} event(s), skipped {skipped} already in the calendar.")
+    if args.rich:
+        return lambda: display_calendar(datetime.now() - timedelta(days=datetime.now().weekday()))
+    return None
+
+def events_export(args):
+    from my_calendar.my_calendar import load_calendar
+    from my_calendar.exchange import ExchangeError, export_events
+    try:
+        count = export_events(load_calendar(), args.file)
+    except ExchangeError as e:
+        raise BatchError(str(e))
+    print(f"Exported {count} event(s) to {args.file}.")
+    return None
+
+def receipts_all(args):
+    from students.students import generate_all_receipts, receipts_directory
+    year, month = args.month or (None, None)
+    receipt_files = generate_all_receipts(year, month, show=args.rich)
+    if not receipt_files:
+        raise BatchError("no attendance records found for that month")
+    if not args.rich:
+        print(f"Wrote {len(receipt_files)} receipt(s) and a summary to {receipts_directory}.")
+    return None
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="planner", description="Run planner commands without the interactive menus.")
+    parser.add_argument("--rich", action="store_true", help="show the updated table when done")
+    sections = parser.add_subparsers(dest="section", required=True)
+
+    tasks = sections.add_parser("tasks").add_subparsers(dest="command", required=True)
+    add = tasks.add_parser("add", help="add one task, or many from a CSV with title,day,time[,recurrence,deadline]")
+    add.add_argument("title", nargs="?")
+    add.add_argument("--file")
+    add.add_argument("--day", default="")
+    add.add_argument("--time", default="")
+    add.add_argument("--recurrence", default="none")
+    add.add_argument("--deadline", default="")
+    add.set_defaults(run=tasks_add)
+    done = tasks.add_parser("done", help="mark tasks done by ID")
+    done.add_argument("ids", nargs="+", type=int)
+    done.set_defaults(run=tasks_done)
+    tasks.add_parser("schedule", help="schedule every unscheduled task").set_defaults(run=tasks_schedule)
+    tasks.add_parser("list").set_defaults(run=tasks_list)
+
+    attendance = sections.add_parser("attendance").add_subparsers(dest="command", required=True)
+    mark = attendance.add_parser("mark", help="mark attendance for student IDs")
+    mark.add_argument("ids", nargs="+", type=int)
+    mark.add_argument("--date", type=parse_date, help="YYYY-MM-DD (default: today)")
+    mark.set_defaults(run=attendance_mark)
+
+    habits = sections.add_parser("habits").add_subparsers(dest="command", required=True)
+    done = habits.add_parser("done", help="mark habits done by ID")
+    done.add_argument("ids", nargs="+", type=int)
+    done.add_argument("--date", type=parse_date, help="YYYY-MM-DD (default: today)")
+    done.set_defaults(run=habits_done)
+
+    deadlines = sections.add_parser("deadlines").add_subparsers(dest="command", required=True)
+    add = deadlines.add_parser("add")
+    add.add_argument("name")
+    add.add_argument("due_date", type=parse_date, help="YYYY-MM-DD")
+    add.set_defaults(run=deadlines_add)
+
+    events = sections.add_parser("events").add_subparsers(dest="command", required=True)
+    imports = events.add_parser("import", help="import events from an .ics file or a CSV with title,start_time,end_time[,recurrence,count,until]")
+    imports.add_argument("file")
+    imports.set_defaults(run=events_import)
+    exports = events.add_parser("export", help="write every event to an .ics or .csv file")
+    exports.add_argument("file")
+    exports.set_defaults(run=events_export)
+
+    receipts = sections.add_parser("receipts").add_subparsers(dest="command", required=True)
+    every = receipts.add_parser("all", help="write every student's receipt for a month")
+    every.add_argument("--month", type=parse_month, help="YYYY-MM (default: this month)")
+    every.set_defaults(run=receipts_all)
+    return parser
+
+def run(argv):
+    """Run one command; returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        show = args.run(args)
+    except (BatchError, OSError) as e:
+        print(f"planner: {e}", file=sys.stderr)
+        return 1
+    store.flush()
+    if show:
+        show()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1:]))
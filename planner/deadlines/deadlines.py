@@ -1,22 +1,42 @@
-import json
-from datetime import datetime, timedelta
-from rich.console import Console
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
+from ui import console
 from rich.table import Table
+from storage import store, decode_valid
+from deadlines.models import Deadline
 
-console = Console()
+deadlines_file = "deadlines/deadlines.json"
+DEFAULT_SOON_DAYS = 7
+
+def due_key(deadline):
+    return deadline.due_date
+
+def decode_deadlines(deadlines):
+    """Parse due dates once on load and put the list in date order.
+
+    Dates are kept as date objects in memory and written back zero-padded,
+    so older entries like "2024-8-14" are normalised on the next save.
+    """
+    deadlines = decode_valid(deadlines, Deadline.from_dict, "deadline")
+    deadlines.sort(key=due_key)
+    return deadlines
+
+def encode_deadlines(deadlines):
+    return [deadline.to_dict() for deadline in deadlines]
+
+store.register("deadlines", deadlines_file, decode=decode_deadlines, encode=encode_deadlines)
 
 def save_deadlines(deadlines):
-    """Save the list of deadlines to a JSON file."""
-    with open("deadlines/deadlines.json", "w") as f:
-        json.dump(deadlines, f)
+    """Save the list of deadlines; it is written to disk on the next store flush."""
+    store.set("deadlines", deadlines)
 
 def load_deadlines():
-    """Load the list of deadlines from a JSON file."""
+    """Load the list of deadlines from the shared store."""
     try:
-        with open("deadlines/deadlines.json", "r") as f:
-            return sorted(json.load(f), key=lambda x: x['due_date'])
-    except FileNotFoundError:
-        return []
+        return store.get("deadlines")
+    except ValueError as e:
+        console.print(f"[bold red]Error loading deadlines: {e}[/bold red]")
+    return []
 
 def add_deadline():
     """Add a new deadline."""
@@ -34,14 +54,28 @@ def add_deadline():
         return
     
     deadlines = load_deadlines()
-    deadlines.append({"name": name, "due_date": due_date.strftime("%Y-%m-%d")})
-    deadlines = sorted(deadlines, key=lambda x: x['due_date'])
+    insort(deadlines, Deadline(name, due_date), key=due_key)
     save_deadlines(deadlines)
     console.print("[bold green]Deadline added successfully![/bold green]")
 
-def display_deadlines():
-    """Display all deadlines sorted by date."""
-    deadlines = load_deadlines()
+def due_between(deadlines, first, last):
+    """Deadlines due from first to last inclusive, found by bisecting the sorted list."""
+    return deadlines[bisect_left(deadlines, first, key=due_key):bisect_right(deadlines, last, key=due_key)]
+
+def due_within(deadlines, days, today=None):
+    """Deadlines due from today through the next days days."""
+    today = today or date.today()
+    return due_between(deadlines, today, today + timedelta(days=days))
+
+def overdue(deadlines, today=None):
+    """Deadlines whose due date has passed."""
+    today = today or date.today()
+    return deadlines[:bisect_left(deadlines, today, key=due_key)]
+
+def display_deadlines(deadlines=None, title="Deadlines"):
+    """Display deadlines (all of them by default) sorted by date."""
+    if deadlines is None:
+        deadlines = load_deadlines()
     today = datetime.today().date()
     tomorrow = today + timedelta(days=1)
 
@@ -49,19 +83,33 @@ def display_deadlines():
         console.print("[bold yellow]No deadlines found.[/bold yellow]")
         return
 
-    table = Table(title="Deadlines", show_header=True, header_style="bold magenta")
+    table = Table(title=title, show_header=True, header_style="bold magenta")
     table.add_column("Assignment/Test", style="bold white")
     table.add_column("Due Date", style="bold white")
 
     for deadline in deadlines:
-        due_date = datetime.strptime(deadline['due_date'], "%Y-%m-%d").date()
-        if due_date == tomorrow:
+        due_date = deadline.due_date.isoformat()
+        if deadline.due_date == tomorrow:
             # Highlight the entire row in pink and set the text color to white
             table.add_row(
-                f"[bold white on #FF69B4]{deadline['name']}[/bold white on #FF69B4]",
-                f"[bold white on #FF69B4]{deadline['due_date']}[/bold white on #FF69B4]"
+                f"[bold white on #FF69B4]{deadline.name}[/bold white on #FF69B4]",
+                f"[bold white on #FF69B4]{due_date}[/bold white on #FF69B4]"
             )
         else:
-            table.add_row(deadline['name'], deadline['due_date'])
+            table.add_row(deadline.name, due_date)
 
     console.print(table)
+
+def display_due_soon():
+    """Display deadlines due in the next few days."""
+    days = console.input(f"[#FC6C85]Number of days (blank for {DEFAULT_SOON_DAYS}): [/#FC6C85]").strip()
+    try:
+        days = int(days) if days else DEFAULT_SOON_DAYS
+    except ValueError:
+        console.print("[bold red]Invalid number of days.[/bold red]")
+        return
+    display_deadlines(due_within(load_deadlines(), days), title=f"Due in the Next {days} Days")
+
+def display_overdue():
+    """Display deadlines that have already passed."""
+    display_deadlines(overdue(load_deadlines()), title="Overdue")
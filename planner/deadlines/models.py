@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from storage import Record
+
+@dataclass(slots=True)
+class Deadline(Record):
+    """A named due date."""
+    name: str
+    due_date: date
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build a deadline from its stored form, raising ValueError if a field is missing or malformed."""
+        try:
+            # strptime also reads older, unpadded dates like "2024-8-14"
+            return cls(str(record["name"]), datetime.strptime(record["due_date"], "%Y-%m-%d").date())
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"invalid deadline {record!r}: {e!r}")
+
+    def to_dict(self):
+        """Stored form of the deadline, with a zero-padded ISO date."""
+        return {"name": self.name, "due_date": self.due_date.isoformat()}
@@ -0,0 +1,82 @@
+from datetime import date
+import pandas as pd
+from ui import console
+from rich.table import Table
+from habits.habits import load_habits
+
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+def completion_matrix(habit_data, today=None):
+    """Boolean DataFrame with one row per day up to today and one column per habit ID."""
+    today = today or date.today()
+    first = min((habit.completion[0][0] for habit in habit_data if habit.completion), default=today)
+    days = pd.date_range(min(first, today.replace(day=1)), today, freq="D")
+    matrix = pd.DataFrame(False, index=days, columns=range(len(habit_data)))
+    for column, habit in enumerate(habit_data):
+        for start, end in habit.completion:
+            matrix.loc[pd.Timestamp(start):pd.Timestamp(end), column] = True
+    return matrix
+
+def habit_stats(habit_data, today=None):
+    """Streaks and completion rates for every habit, computed over the whole matrix at once.
+
+    Returns (summary, heatmap): summary has one row per habit with the current
+    and longest streak and this week's and this month's completion rate;
+    heatmap has the completion rate per day of the week.
+    """
+    today = today or date.today()
+    matrix = completion_matrix(habit_data, today)
+    done = matrix.astype(int)
+
+    # Length of the run of completed days ending on each day: the running
+    # total minus the total as of the last missed day
+    totals = done.cumsum()
+    runs = totals - totals.where(~matrix).ffill().fillna(0)
+    # A streak is still current if today is simply not done yet
+    current = runs.iloc[-1].where(matrix.iloc[-1], runs.iloc[-2] if len(runs) > 1 else 0)
+
+    week_start = pd.Timestamp(today) - pd.Timedelta(days=today.weekday())
+    month_start = pd.Timestamp(today.replace(day=1))
+    summary = pd.DataFrame({
+        "title": [habit.title for habit in habit_data],
+        "current_streak": current.astype(int),
+        "longest_streak": runs.max().astype(int),
+        "week_rate": done[week_start:].mean(),
+        "month_rate": done[month_start:].mean(),
+    })
+    heatmap = done.groupby(done.index.dayofweek).mean().reindex(range(7), fill_value=0.0)
+    heatmap.index = DAY_NAMES
+    return summary, heatmap
+
+def rate_cell(rate):
+    """Format a completion rate, highlighting days done at least half the time."""
+    text = f"{rate:.0%}"
+    return f"[bold #FC6C85]{text}[/bold #FC6C85]" if rate >= 0.5 else f"[dim]{text}[/dim]"
+
+def display_habit_stats():
+    """Display streaks, completion rates and a day-of-week heatmap for all habits."""
+    habit_data = load_habits()
+    if not habit_data:
+        console.print("[bold red]No habits found. Add a new habit![/bold red]")
+        return
+
+    summary, heatmap = habit_stats(habit_data)
+    table = Table(title="Habit Stats", show_header=True, header_style="bold magenta")
+    table.add_column("ID", style="bold #FC6C85")
+    table.add_column("Habit", style="bold #FC6C85")
+    table.add_column("Streak", justify="right")
+    table.add_column("Best", justify="right")
+    table.add_column("This Week", justify="right")
+    table.add_column("This Month", justify="right")
+    for i, row in summary.iterrows():
+        table.add_row(str(i), row["title"], str(row["current_streak"]), str(row["longest_streak"]),
+                      rate_cell(row["week_rate"]), rate_cell(row["month_rate"]))
+    console.print(table)
+
+    table = Table(title="By Day of Week", show_header=True, header_style="bold magenta")
+    table.add_column("Habit", style="bold #FC6C85")
+    for day in DAY_NAMES:
+        table.add_column(day, justify="right")
+    for i, row in summary.iterrows():
+        table.add_row(row["title"], *(rate_cell(heatmap.at[day, i]) for day in DAY_NAMES))
+    console.print(table)
@@ -1,43 +1,88 @@
-import json
+import calendar
 import os
-from datetime import datetime
-from rich.console import Console
+import subprocess
+from datetime import date
+from ui import console
 from rich.table import Table
+from storage import store, decode_valid
+from habits.history import mark_done, days_in_month
+from habits.models import Habit
 
-console = Console()
 habit_data = []  # List to hold habits
 habit_file = "habits_data.json"  # File to store habit data
+LEGACY_MONTH_ENV = "PLANNER_HABITS_MONTH"  # YYYY-MM that bare day numbers in old files belong to
+
+def legacy_month():
+    """First day of the month bare day numbers are read in: LEGACY_MONTH_ENV if set, else the current month."""
+    value = os.environ.get(LEGACY_MONTH_ENV)
+    if value:
+        try:
+            return date.fromisoformat(f"{value}-01")
+        except ValueError:
+            console.print(f"[bold red]{LEGACY_MONTH_ENV} must be a month like 2024-08, not '{value}'; using the current month.[/bold red]")
+    return date.today().replace(day=1)
+
+def decode_habits(data):
+    """Turn stored completions into date ranges.
+
+    Old files list bare day numbers with no month. As the old display did,
+    they are read as days of the current month, or of the month in
+    LEGACY_MONTH_ENV, and saved back as dates. Entries that cannot be placed
+    are reported, since the next save leaves them out.
+    """
+    month = date.today()
+    if any(str(entry).isdigit() for record in data if isinstance(record, dict) for entry in record.get("completion", [])):
+        month = legacy_month()
+        console.print(f"[bold yellow]Reading the day numbers in {habit_file} as days of {month.strftime('%B %Y')}; "
+                      f"set {LEGACY_MONTH_ENV}=YYYY-MM before saving to use another month.[/bold yellow]")
+
+    def decode(record):
+        unplaced = []
+        habit = Habit.from_dict(record, month, unplaced)
+        for entry in unplaced:
+            console.print(f"[bold red]Could not date '{entry}' in habit '{habit.title}' ({month.strftime('%B %Y')}); it will not be saved.[/bold red]")
+        return habit
+    return decode_valid(data, decode, "habit")
+
+def encode_habits(data):
+    return [habit.to_dict() for habit in data]
+
+store.register("habits", habit_file, decode=decode_habits, encode=encode_habits)
 
 def load_habits():
-    """Load habits from the JSON file."""
+    """Load habits from the shared store."""
     global habit_data
-    if os.path.exists(habit_file):
-        with open(habit_file, 'r') as f:
-            habit_data = json.load(f)
+    try:
+        habit_data = store.get("habits")
+    except ValueError as e:
+        console.print(f"[bold red]Error loading habits: {e}[/bold red]")
+        habit_data = []
+    return habit_data
 
 def save_habits():
-    """Save habits to the JSON file."""
-    with open(habit_file, 'w') as f:
-        json.dump(habit_data, f, default=str)
+    """Save habits; they are written to disk on the next store flush."""
+    store.set("habits", habit_data)
 
-def display_habits():
-    """Display all habits with their completion status."""
+def display_habits(month=None):
+    """Display all habits with their completion status for a month (the current one by default)."""
     load_habits()
     if not habit_data:
         console.print("[bold red]No habits found. Add a new habit![/bold red]")
         return
 
-    table = Table(title="Habits Tracker", show_header=True, header_style="bold magenta", show_lines=True)
+    month = month or date.today()
+    days = range(1, calendar.monthrange(month.year, month.month)[1] + 1)
+    table = Table(title=f"Habits Tracker - {month.strftime('%B %Y')}", show_header=True, header_style="bold magenta", show_lines=True)
     table.add_column("ID", style="bold #FC6C85")
     table.add_column("Habit", style="bold #FC6C85")
-    for day in range(1, 32):
+    for day in days:
         table.add_column(str(day), style="bold #FC6C85")
 
     for i, habit in enumerate(habit_data):
-        habit_row = [str(i), habit["title"]]
-        for day in range(1, 32):
-            day_str = str(day)
-            habit_row.append("[bold #FC6C85]X[/bold #FC6C85]" if day_str in habit["completion"] else "")
+        habit_row = [str(i), habit.title]
+        completed = days_in_month(habit.completion, month.year, month.month)
+        for day in days:
+            habit_row.append("[bold #FC6C85]X[/bold #FC6C85]" if day in completed else "")
         table.add_row(*habit_row)
 
     console.print(table)
@@ -46,7 +91,7 @@ def add_habit():
     """Add a new habit."""
     load_habits()
     title = console.input("[#FC6C85]Habit title: [/#FC6C85]")
-    habit_data.append({"title": title, "completion": []})
+    habit_data.append(Habit(title))
     save_habits()
     console.print("[bold #FC6C85]Habit added successfully![/bold #FC6C85]")
 
@@ -68,10 +113,38 @@ def mark_habit_done():
     display_habits()
     habit_id = int(console.input("[#FC6C85]Enter habit ID to mark as done for today: [/#FC6C85]"))
     if 0 <= habit_id < len(habit_data):
-        today = str(datetime.now().day)
-        if today not in habit_data[habit_id]["completion"]:
-            habit_data[habit_id]["completion"].append(today)
+        mark_done(habit_data[habit_id].completion, date.today())
         save_habits()
         console.print("[bold #FC6C85]Habit marked as done for today![/bold #FC6C85]")
     else:
         console.print("[bold red]Invalid habit ID![/bold red]")
+
+def view_habit_info():
+    """Show a habit's details file and offer to edit it in the default text editor."""
+    load_habits()
+    display_habits()
+    try:
+        habit_id = int(console.input("[#FC6C85]Enter habit ID to view: [/#FC6C85]"))
+    except ValueError:
+        console.print("[bold red]Invalid input! Please enter a valid habit ID.[/bold red]")
+        return
+    if not 0 <= habit_id < len(habit_data):
+        console.print("[bold red]Invalid habit ID![/bold red]")
+        return
+
+    habit = habit_data[habit_id]
+    details_file = f"{habit.title}_details.txt"  # Kept next to the habits file, one per habit
+    try:
+        with open(details_file, 'r') as f:
+            details = f.read().strip()
+    except OSError:
+        details = ""
+    console.print(f"[bold #FC6C85]{habit.title}[/bold #FC6C85]")
+    console.print(details or "No details yet.")
+
+    if console.input("[#FC6C85]Edit details? (yes/no): [/#FC6C85]").strip().lower() == "yes":
+        try:
+            editor = os.environ.get('EDITOR', 'nano')  # Use 'nano' editor by default
+            subprocess.run([editor, details_file])
+        except Exception as e:
+            console.print(f"[bold red]Failed to open editor: {e}[/bold red]")
@@ -0,0 +1,81 @@
+import calendar
+from bisect import bisect_right
+from datetime import date, timedelta
+
+# A habit's completion history is a sorted list of (first, last) date ranges
+# of consecutive completed days, so a year of daily check-ins is a single
+# entry on disk and a day or month is found with a binary search.
+
+def _first(date_range):
+    return date_range[0]
+
+def is_done(ranges, day):
+    """Whether day falls inside one of the completed ranges."""
+    i = bisect_right(ranges, day, key=_first) - 1
+    return i >= 0 and ranges[i][1] >= day
+
+def mark_done(ranges, day):
+    """Add day to the ranges in place, merging it with neighbouring ranges."""
+    i = bisect_right(ranges, day, key=_first)
+    one_day = timedelta(days=1)
+    if i > 0 and ranges[i - 1][1] >= day:
+        return  # Already done
+    joins_previous = i > 0 and ranges[i - 1][1] + one_day == day
+    joins_next = i < len(ranges) and ranges[i][0] - one_day == day
+    if joins_previous and joins_next:
+        ranges[i - 1] = (ranges[i - 1][0], ranges[i][1])
+        del ranges[i]
+    elif joins_previous:
+        ranges[i - 1] = (ranges[i - 1][0], day)
+    elif joins_next:
+        ranges[i] = (day, ranges[i][1])
+    else:
+        ranges.insert(i, (day, day))
+
+def days_in_month(ranges, year, month):
+    """Set of day numbers completed in the given month."""
+    month_start = date(year, month, 1)
+    month_end = date(year, month, calendar.monthrange(year, month)[1])
+    days = set()
+    i = max(0, bisect_right(ranges, month_start, key=_first) - 1)
+    while i < len(ranges) and ranges[i][0] <= month_end:
+        first, last = ranges[i]
+        if last >= month_start:
+            days.update(range(max(first, month_start).day, min(last, month_end).day + 1))
+        i += 1
+    return days
+
+def merge_ranges(ranges):
+    """Sort ranges and merge the ones that overlap or touch."""
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and merged[-1][1] + timedelta(days=1) >= first:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+def decode_completion(entries, legacy_month, unplaced=None):
+    """Read stored completions into ranges.
+
+    Entries are [first, last] ISO date pairs; bare day numbers from the old
+    format are taken as days of legacy_month (a date in that month). Entries
+    that are not a day of that month or a date are appended to unplaced.
+    """
+    ranges = []
+    for entry in entries:
+        if isinstance(entry, list):
+            ranges.append((date.fromisoformat(entry[0]), date.fromisoformat(entry[1])))
+            continue
+        try:
+            day = legacy_month.replace(day=int(entry)) if str(entry).isdigit() else date.fromisoformat(entry)
+        except (TypeError, ValueError):
+            if unplaced is not None:
+                unplaced.append(entry)
+            continue
+        ranges.append((day, day))
+    return merge_ranges(ranges)
+
+def encode_completion(ranges):
+    """Stored form of completion ranges: [[first, last], ...] as ISO dates."""
+    return [[first.isoformat(), last.isoformat()] for first, last in ranges]
@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from storage import Record
+from habits.history import decode_completion, encode_completion
+
+@dataclass(slots=True)
+class Habit(Record):
+    """A habit and its completed days as sorted (first, last) date ranges."""
+    title: str
+    completion: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, record, legacy_month, unplaced=None):
+        """Build a habit from its stored form; legacy_month dates bare day numbers from old files.
+
+        Completion entries that cannot be dated are appended to unplaced.
+        """
+        try:
+            return cls(str(record["title"]), decode_completion(record.get("completion", []), legacy_month, unplaced))
+        except (KeyError, TypeError, IndexError, ValueError) as e:
+            raise ValueError(f"invalid habit {record!r}: {e!r}")
+
+    def to_dict(self):
+        """Stored form of the habit."""
+        return {"title": self.title, "completion": encode_completion(self.completion)}
@@ -1,15 +1,28 @@
+import atexit
 import calendar
+import sys
 from datetime import datetime, timedelta
-from rich.console import Console
 from rich.table import Table
-from my_calendar.my_calendar import display_calendar, add_event, modify_event, remove_event, display_today
-from tasks.tasks import display_tasks, add_task, modify_task, mark_task_done, delete_task, schedule_task
-from notes.notes import display_folders, display_notes_tree, new_folder, new_note, delete_note, delete_folder, modify_note
-from habits.habits import display_habits, add_habit, delete_habit, mark_habit_done
-from students.students import display_students, add_student, delete_student, mark_attendance, display_receipts
-from deadlines.deadlines import display_deadlines, add_deadline
+from storage import store
+from ui import console
 
-console = Console()
+# Each menu section imports its module the first time it is opened, so
+# starting the planner only loads what the main menu needs
+atexit.register(store.flush)
+
+prompted = False  # Reminders start at the second prompt, so the first one does not wait for the calendar and deadlines
+
+def prompt_choice():
+    """Write out pending changes and show due reminders, then ask for the next menu choice."""
+    global prompted
+    store.flush()
+    if prompted:
+        from reminders import reminders
+        reminders.refresh()
+        for alert in reminders.drain():
+            console.print(f"[bold white on #FF69B4]Reminder:[/bold white on #FF69B4] {alert}")
+    prompted = True
+    return console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
 
 def display_monthly_calendar(current_date):
     cal = calendar.Calendar()
@@ -29,114 +42,166 @@ def display_monthly_calendar(current_date):
 
     console.print(table)
 
+def calendar_menu():
+    from my_calendar.my_calendar import display_calendar, add_event, modify_event, remove_event, import_calendar, export_calendar, display_conflicts
+    week_start = datetime.now() - timedelta(days=datetime.now().weekday())
+    while True:
+        display_calendar(week_start)
+        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, modify, remove, conflicts, import, export, back, next, prev)")
+        cal_choice = prompt_choice()
+        if cal_choice == "add":
+            add_event()
+        elif cal_choice == "modify":
+            modify_event()
+        elif cal_choice == "remove":
+            remove_event()
+        elif cal_choice == "conflicts":
+            display_conflicts()
+        elif cal_choice == "import":
+            import_calendar()
+        elif cal_choice == "export":
+            export_calendar()
+        elif cal_choice == "next":
+            week_start += timedelta(days=7)
+        elif cal_choice == "prev":
+            week_start -= timedelta(days=7)
+        elif cal_choice == "back":
+            break
+
+def today_menu():
+    from my_calendar.my_calendar import display_today
+    display_today()
+
+def tasks_menu():
+    from tasks.tasks import display_tasks, add_task, modify_task, mark_task_done, delete_task, schedule_task, schedule_all
+    while True:
+        display_tasks()
+        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, modify, done, delete, schedule, schedule all, back)")
+        task_choice = prompt_choice()
+        if task_choice == "add":
+            add_task()
+        elif task_choice == "modify":
+            modify_task()
+        elif task_choice == "done":
+            mark_task_done()
+        elif task_choice == "delete":
+            delete_task()
+        elif task_choice == "schedule":
+            schedule_task()
+        elif task_choice == "schedule all":
+            schedule_all()
+        elif task_choice == "back":
+            break
+
+def notes_menu():
+    from notes.notes import display_notes_tree, new_folder, new_note, delete_note, delete_folder, modify_note, search_notes
+    while True:
+        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (newfolder, newnote, modify, deletefolder, deletenote, show, search, back)")
+        note_choice = prompt_choice()
+        if note_choice == "newfolder":
+            new_folder()
+        elif note_choice == "newnote":
+            new_note()
+        elif note_choice == "deletefolder":
+            delete_folder()
+        elif note_choice == "deletenote":
+            delete_note()
+        elif note_choice == "show":
+            display_notes_tree()
+        elif note_choice == "search":
+            search_notes()
+        elif note_choice == "back":
+            break
+        elif note_choice == "modify":
+            modify_note()
+
+def habits_menu():
+    from habits.habits import display_habits, add_habit, delete_habit, view_habit_info, mark_habit_done
+    habit_month = datetime.now().replace(day=1)
+    while True:
+        display_habits(habit_month)
+        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, delete, info, done, stats, next, prev, back)")
+        habit_choice = prompt_choice()
+        if habit_choice == "add":
+            add_habit()
+        elif habit_choice == "delete":
+            delete_habit()
+        elif habit_choice == "info":
+            view_habit_info()
+        elif habit_choice == "done":
+            mark_habit_done()
+        elif habit_choice == "stats":
+            from habits.analytics import display_habit_stats  # Pulls in pandas, so only when asked for
+            display_habit_stats()
+        elif habit_choice == "next":
+            habit_month = (habit_month.replace(day=28) + timedelta(days=4)).replace(day=1)
+        elif habit_choice == "prev":
+            habit_month = (habit_month - timedelta(days=1)).replace(day=1)
+        elif habit_choice == "back":
+            break
+
+def students_menu():
+    from students.students import display_students, add_student, delete_student, mark_attendance, display_receipts, display_all_receipts
+    while True:
+        display_students()
+        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, delete, attendance, receipts, receipts all, back)")
+        student_choice = prompt_choice()
+        if student_choice == "add":
+            add_student()
+        elif student_choice == "delete":
+            delete_student()
+        elif student_choice == "attendance":
+            mark_attendance()
+        elif student_choice == "receipts":
+            display_receipts()
+        elif student_choice == "receipts all":
+            display_all_receipts()
+        elif student_choice == "back":
+            break
+
+def deadlines_menu():
+    from deadlines.deadlines import display_deadlines, add_deadline, display_due_soon, display_overdue
+    while True:
+        display_deadlines()
+        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, soon, overdue, back)")
+        deadline_choice = prompt_choice()
+        if deadline_choice == "add":
+            add_deadline()
+        elif deadline_choice == "soon":
+            display_due_soon()
+        elif deadline_choice == "overdue":
+            display_overdue()
+        elif deadline_choice == "back":
+            break
+
+MENUS = {
+    "cal": calendar_menu,
+    "today": today_menu,
+    "tasks": tasks_menu,
+    "notes": notes_menu,
+    "habits": habits_menu,
+    "students": students_menu,
+    "deadlines": deadlines_menu,
+}
+
 def main():
     current_date = datetime.now()
     while True:
         display_monthly_calendar(current_date)
         console.print("[bold #FC6C85]Menu:[/bold #FC6C85] (cal, today, tasks, notes, habits, students, deadlines, next, prev, exit)")
-        choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
+        choice = prompt_choice()
 
         if choice == "next":
             current_date = (current_date.replace(day=28) + timedelta(days=4)).replace(day=1)
         elif choice == "prev":
             current_date = (current_date.replace(day=1) - timedelta(days=1)).replace(day=1)
-        elif choice == "cal":
-            week_start = datetime.now() - timedelta(days=datetime.now().weekday())
-            while True:
-                display_calendar(week_start)
-                console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, modify, remove, back, next, prev)")
-                cal_choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
-                if cal_choice == "add":
-                    add_event()
-                elif cal_choice == "modify":
-                    modify_event()
-                elif cal_choice == "remove":
-                    remove_event()
-                elif cal_choice == "next":
-                    week_start += timedelta(days=7)
-                elif cal_choice == "prev":
-                    week_start -= timedelta(days=7)
-                elif cal_choice == "back":
-                    break
-        elif choice == "today":
-            display_today()
-        elif choice == "tasks":
-            while True:
-                display_tasks()
-                console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, modify, done, delete, schedule, back)")
-                task_choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
-                if task_choice == "add":
-                    add_task()
-                elif task_choice == "modify":
-                    modify_task()
-                elif task_choice == "done":
-                    mark_task_done()
-                elif task_choice == "delete":
-                    delete_task()
-                elif task_choice == "schedule":
-                    schedule_task()
-                elif task_choice == "back":
-                    break
-        elif choice == "notes":
-            while True:
-                console.print("[bold #FC6C85]Options:[/bold #FC6C85] (newfolder, newnote, modify, deletefolder, deletenote, show, back)")
-                note_choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
-                if note_choice == "newfolder":
-                    new_folder()
-                elif note_choice == "newnote":
-                    new_note()
-                elif note_choice == "deletefolder":
-                    delete_folder()
-                elif note_choice == "deletenote":
-                    delete_note()
-                elif note_choice == "show":
-                    display_notes_tree()
-                elif note_choice == "back":
-                    break
-                elif note_choice == "modify":
-                    modify_note()
-
-        elif choice == "habits":
-            while True:
-                display_habits()
-                console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, delete, info, done, back)")
-                habit_choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
-                if habit_choice == "add":
-                    add_habit()
-                elif habit_choice == "delete":
-                    delete_habit()
-                elif habit_choice == "info":
-                    view_habit_info()
-                elif habit_choice == "done":
-                    mark_habit_done()
-                elif habit_choice == "back":
-                    break
-        elif choice == "students":
-            while True:
-                display_students()
-                console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, delete, attendance, receipts, back)")
-                student_choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
-                if student_choice == "add":
-                    add_student()
-                elif student_choice == "delete":
-                    delete_student()
-                elif student_choice == "attendance":
-                    mark_attendance()
-                elif student_choice == "receipts":
-                    display_receipts()
-                elif student_choice == "back":
-                    break
-        elif choice == "deadlines":
-            while True:
-                display_deadlines()
-                console.print("[bold #FC6C85]Options:[/bold #FC6C85] (add, back)")
-                deadline_choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]")
-                if deadline_choice == "add":
-                    add_deadline()
-                elif deadline_choice == "back":
-                    break
+        elif choice in MENUS:
+            MENUS[choice]()
         elif choice == "exit":
             break
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import run  # Arguments mean a scripted command rather than the menus
+        sys.exit(run(sys.argv[1:]))
     main()
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+
+# Hours of the day tasks may be placed in
+DAY_START_HOUR = 8
+DAY_END_HOUR = 23
+DEFAULT_GRANULARITY = 30  # minutes
+DEFAULT_HORIZON_DAYS = 7
+
+class Availability:
+    """Per-day bitsets of occupied time slots, built from an EventIndex.
+
+    Bit i of a day's mask is set when the slot starting i * granularity
+    minutes after midnight is taken by an event. Finding a gap of n free
+    slots is then a handful of shifts and ands on a Python int per day rather
+    than a comparison against every event.
+    """
+
+    def __init__(self, event_index, granularity=DEFAULT_GRANULARITY, day_start_hour=DAY_START_HOUR, day_end_hour=DAY_END_HOUR):
+        if (24 * 60) % granularity:
+            raise ValueError("Granularity must divide a day evenly")
+        self.event_index = event_index
+        self.granularity = granularity
+        self.slot = timedelta(minutes=granularity)
+        self.first_slot = day_start_hour * 60 // granularity
+        self.last_slot = day_end_hour * 60 // granularity
+        self._masks = {}
+
+    def occupied(self, day):
+        """Return the occupied-slot bitmask for a date."""
+        if day not in self._masks:
+            mask = 0
+            for event in self.event_index.on_day(day):
+                mask |= self._span_mask(day, event.start_time, event.end_time)
+            self._masks[day] = mask
+        return self._masks[day]
+
+    def reserve(self, start_time, end_time):
+        """Mark [start_time, end_time) as taken, e.g. after scheduling into it."""
+        day = start_time.date()
+        while datetime.combine(day, datetime.min.time()) < end_time:
+            self._masks[day] = self.occupied(day) | self._span_mask(day, start_time, end_time)
+            day += timedelta(days=1)
+
+    def find_slot(self, earliest, duration, horizon_days=DEFAULT_HORIZON_DAYS, latest=None):
+        """Return the first start time at or after earliest with duration free, or None.
+
+        Days from earliest's date up to horizon_days later are searched, and
+        the whole duration has to fit inside the day's schedulable hours and
+        end no later than latest, if given.
+        """
+        needed = max(1, -(-duration // self.slot))  # Round up to whole slots
+        for offset in range(horizon_days):
+            day = earliest.date() + timedelta(days=offset)
+            day_start = datetime.combine(day, datetime.min.time())
+            lo = self.first_slot
+            if offset == 0:
+                lo = max(lo, -(-(earliest - day_start) // self.slot))
+            hi = self.last_slot
+            if latest is not None:
+                if latest <= day_start:
+                    break
+                hi = min(hi, (latest - day_start) // self.slot)
+            if hi - lo < needed:
+                continue
+
+            window = ((1 << (hi - lo)) - 1) << lo
+            free = ~self.occupied(day) & window
+            # After this loop bit i is set iff slots i .. i + needed - 1 are all free
+            run, length = free, 1
+            while length < needed:
+                shift = min(length, needed - length)
+                run &= run >> shift
+                length += shift
+            run &= window
+            if run:
+                return day_start + self.slot * ((run & -run).bit_length() - 1)
+        return None
+
+    def find_chunks(self, earliest, duration, latest):
+        """Split duration over the free time between earliest and latest.
+
+        Returns a list of (start, end) pieces, taking the earliest free
+        stretches first, or None if there is not enough free time in total.
+        """
+        chunks = []
+        remaining = duration
+        day = earliest.date()
+        while remaining > timedelta(0) and datetime.combine(day, datetime.min.time()) < latest:
+            for start_time, end_time in self._free_runs(day, earliest, latest):
+                end_time = min(end_time, start_time + remaining)
+                chunks.append((start_time, end_time))
+                remaining -= end_time - start_time
+                if remaining <= timedelta(0):
+                    break
+            day += timedelta(days=1)
+        return chunks if remaining <= timedelta(0) else None
+
+    def _free_runs(self, day, earliest, latest):
+        """Yield (start, end) for each maximal free stretch of a day's schedulable hours."""
+        day_start = datetime.combine(day, datetime.min.time())
+        lo = max(self.first_slot, -(-(earliest - day_start) // self.slot))
+        hi = min(self.last_slot, (latest - day_start) // self.slot)
+        occupied = self.occupied(day)
+        slot = lo
+        while slot < hi:
+            if occupied >> slot & 1:
+                slot += 1
+                continue
+            start = slot
+            while slot < hi and not occupied >> slot & 1:
+                slot += 1
+            yield day_start + self.slot * start, day_start + self.slot * slot
+
+    def _span_mask(self, day, start_time, end_time):
+        day_start = datetime.combine(day, datetime.min.time())
+        first = max(0, (start_time - day_start) // self.slot)
+        last = min(24 * 60 // self.granularity, -(-(end_time - day_start) // self.slot))
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
@@ -0,0 +1,64 @@
+import heapq
+from itertools import count
+from .event_index import start_key
+from .models import Occurrence
+from .recurrence import is_rule, expand_event, last_occurrence_end
+
+# Overlapping events are found with a sweep over start times: events are
+# visited in start order while a heap keeps the ones still running, ordered
+# by end. Everything left on the heap when an event starts overlaps it, so a
+# report costs O(N log N) plus one step per conflicting pair.
+
+def sweep_conflicts(events):
+    """Yield (earlier, later) for every pair of overlapping events.
+
+    Events that take no time never conflict. Pairs come out in order of the
+    later event's start.
+    """
+    running = []
+    tiebreak = count()
+    for event in sorted(events, key=start_key):
+        if event.end_time <= event.start_time:
+            continue
+        while running and running[0][0] <= event.start_time:
+            heapq.heappop(running)
+        for _, _, other in running:
+            yield other, event
+        heapq.heappush(running, (event.end_time, next(tiebreak), event))
+
+def conflicts_between(event_index, t0, t1):
+    """Return the overlapping pairs of events whose overlap falls inside [t0, t1), sorted by when it starts."""
+    pairs = [
+        (first, second) for first, second in sweep_conflicts(event_index.overlapping(t0, t1))
+        if max(first.start_time, second.start_time) < t1 and min(first.end_time, second.end_time) > t0
+    ]
+    pairs.sort(key=lambda pair: max(pair[0].start_time, pair[1].start_time))
+    return pairs
+
+def same_event(other, event, occurrence=None):
+    """True if other is event itself or one of its occurrences (only the given one, if set)."""
+    if other is event:
+        return True
+    if not isinstance(other, Occurrence) or other.series is not event:
+        return False
+    return occurrence is None or other.occurrence == occurrence
+
+def clashes(event_index, start_time, end_time, event=None, occurrence=None):
+    """Return the events overlapping [start_time, end_time), leaving out event and its occurrences.
+
+    Each day the window touches costs one binary search in the index, so a
+    check for a new or changed event does not look at the rest of the calendar.
+    """
+    return [
+        other for other in event_index.overlapping(start_time, end_time)
+        if event is None or not same_event(other, event, occurrence)
+    ]
+
+def event_clashes(event_index, event):
+    """Return (occurrence, other) for each event that event, or any occurrence of a rule, overlaps."""
+    if not is_rule(event):
+        return [(event, other) for other in clashes(event_index, event.start_time, event.end_time, event)]
+    found = []
+    for occurrence in expand_event(event, event.start_time, last_occurrence_end(event)):
+        found.extend((occurrence, other) for other in clashes(event_index, occurrence.start_time, occurrence.end_time, event))
+    return found
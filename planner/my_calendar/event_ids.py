@@ -0,0 +1,90 @@
+class EventIds:
+    """Hash indexes over calendar records by their id and by the task they were scheduled for.
+
+    Positions in the calendar list are tracked alongside the ids, so a record
+    is removed by moving the last record into its place instead of searching
+    and shifting the list.
+    """
+
+    def __init__(self, calendar_data):
+        self.calendar_data = calendar_data
+        self.version = None
+        self._positions = {}
+        self._by_task = {}
+        for position, event in enumerate(calendar_data):
+            self._file(event, position)
+
+    def _file(self, event, position):
+        self._positions[event.id] = position
+        if event.task_id:
+            self._by_task.setdefault(event.task_id, set()).add(event.id)
+
+    def get(self, event_id):
+        """Return the record with this id, or None."""
+        position = self._positions.get(event_id)
+        return None if position is None else self.calendar_data[position]
+
+    def for_task(self, task_id):
+        """Return the records scheduled for a task."""
+        return [self.get(event_id) for event_id in self._by_task.get(task_id, ())]
+
+    def add(self, event):
+        """Append a record to the calendar."""
+        self.calendar_data.append(event)
+        self._file(event, len(self.calendar_data) - 1)
+
+    def remove(self, event_id):
+        """Remove the record with this id; returns it, or None if there is none."""
+        position = self._positions.pop(event_id, None)
+        if position is None:
+            return None
+        event = self.calendar_data[position]
+        last = self.calendar_data.pop()
+        if last is not event:
+            self.calendar_data[position] = last
+            self._positions[last.id] = position
+        linked = self._by_task.get(event.task_id)
+        if linked is not None:
+            linked.discard(event_id)
+            if not linked:
+                del self._by_task[event.task_id]
+        return event
+
+    def link(self, event, task_id):
+        """Mark a record in the calendar as scheduled for a task."""
+        event.task_id = task_id
+        self._by_task.setdefault(task_id, set()).add(event.id)
+
+    def remove_unlinked(self, title):
+        """Remove the records with this title that no task is linked to; returns how many there were.
+
+        Events scheduled before ids existed are only known by their task's
+        title, so this scans the calendar and is kept for tasks with no linked events.
+        """
+        event_ids = [event.id for event in self.calendar_data if event.title == title and not event.task_id]
+        for event_id in event_ids:
+            self.remove(event_id)
+        return len(event_ids)
+
+    def remove_task(self, task_id):
+        """Remove every record scheduled for a task; returns how many there were."""
+        event_ids = list(self._by_task.get(task_id, ()))
+        for event_id in event_ids:
+            self.remove(event_id)
+        return len(event_ids)
+
+    def __contains__(self, event_id):
+        return event_id in self._positions
+
+    def __len__(self):
+        return len(self._positions)
+
+_cached_ids = None
+
+def get_event_ids(calendar_data, version):
+    """Return the id indexes for calendar_data, rebuilding them only when the version changes."""
+    global _cached_ids
+    if _cached_ids is None or _cached_ids.calendar_data is not calendar_data or _cached_ids.version != version:
+        _cached_ids = EventIds(calendar_data)
+        _cached_ids.version = version
+    return _cached_ids
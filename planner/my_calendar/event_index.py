@@ -0,0 +1,86 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from .recurrence import is_rule, expand_event, last_occurrence_end
+
+class EventIndex:
+    """Day-bucketed interval index over calendar events.
+
+    Every event is filed under each calendar day it touches, and each day's
+    bucket is kept sorted by start time, so an overlap query only looks at the
+    buckets for the days in the window instead of the whole calendar.
+    Recurrence rules are kept aside with their overall span and expanded
+    only for the queried window.
+    """
+
+    def __init__(self, calendar_data):
+        self.events = sorted((event for event in calendar_data if not is_rule(event)), key=start_key)
+        self.rules = [(_rule_span(event), event) for event in calendar_data if is_rule(event)]
+        self._days = {}
+        one_day = timedelta(days=1)
+        for event in self.events:
+            day = event.start_time.date()
+            last_day = (event.end_time - timedelta(microseconds=1)).date()
+            while day <= last_day:
+                self._days.setdefault(day, []).append(event)
+                day += one_day
+        self._day_starts = {day: [event.start_time for event in bucket] for day, bucket in self._days.items()}
+
+    def overlapping(self, t0, t1):
+        """Return events overlapping the half-open window [t0, t1), sorted by start time."""
+        if t1 <= t0:
+            return []
+        found = []
+        seen = set()
+        day = t0.date()
+        last_day = (t1 - timedelta(microseconds=1)).date()
+        while day <= last_day:
+            bucket = self._days.get(day)
+            if bucket:
+                # Events starting at or after t1 cannot overlap the window
+                end = bisect_left(self._day_starts[day], t1)
+                for event in bucket[:end]:
+                    if event.end_time > t0 and id(event) not in seen:
+                        seen.add(id(event))
+                        found.append(event)
+            day += timedelta(days=1)
+        for (first_start, last_end), rule in self.rules:
+            if first_start < t1 and (last_end is None or last_end > t0):
+                found.extend(expand_event(rule, t0, t1))
+        found.sort(key=start_key)
+        return found
+
+    def on_day(self, day):
+        """Return events overlapping the given date."""
+        day_start = datetime.combine(day, datetime.min.time())
+        return self.overlapping(day_start, day_start + timedelta(days=1))
+
+    def __len__(self):
+        return len(self.events) + len(self.rules)
+
+def start_key(event):
+    return event.start_time
+
+def _rule_span(rule):
+    """Earliest start and latest end any occurrence of the rule can have."""
+    first_start = rule.start_time
+    last_end = last_occurrence_end(rule)
+    duration = rule.end_time - rule.start_time
+    for override in (rule.overrides or {}).values():
+        if "start_time" in override:
+            first_start = min(first_start, override["start_time"])
+            if last_end is not None:
+                last_end = max(last_end, override.get("end_time", override["start_time"] + duration))
+        elif "end_time" in override and last_end is not None:
+            last_end = max(last_end, override["end_time"])
+    return first_start, last_end
+
+_cached_index = None
+_cached_version = None
+
+def get_event_index(calendar_data, version):
+    """Return the index for calendar_data, rebuilding it only when the version changes."""
+    global _cached_index, _cached_version
+    if _cached_index is None or version != _cached_version:
+        _cached_index = EventIndex(calendar_data)
+        _cached_version = version
+    return _cached_index
@@ -0,0 +1,299 @@
+import csv
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+from .models import Event
+from .recurrence import FREQUENCIES, is_rule
+from .timecodec import parse_timestamp, format_timestamp
+
+# Bulk import and export of events as iCalendar (.ics) or CSV. Both formats
+# are read and written a line at a time through generators, so the size of
+# a file only shows up in the events themselves, never as a second copy of
+# its text.
+
+CSV_FIELDS = ["id", "title", "start_time", "end_time", "recurrence", "count", "until", "exceptions", "completed"]
+ICS_DATETIME = "%Y%m%dT%H%M%S"
+ICS_DATE = "%Y%m%d"
+ICS_LINE_LIMIT = 75
+ICS_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+class ExchangeError(ValueError):
+    """A file could not be imported or exported."""
+
+def iter_csv_events(path):
+    """Yield events from a CSV file with at least title, start_time and end_time columns."""
+    with open(path, newline='') as f:
+        for number, row in enumerate(csv.DictReader(f), start=2):
+            row = {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+            try:
+                event = {
+                    "title": row["title"],
+                    "start_time": parse_timestamp(row["start_time"]),
+                    "end_time": parse_timestamp(row["end_time"]),
+                    "recurrence": row.get("recurrence", "").lower() or "none",
+                    "completed": row.get("completed", "").lower() in ("1", "true", "yes"),
+                }
+                if row.get("id"):
+                    event["id"] = row["id"]
+                if event["recurrence"] in FREQUENCIES:
+                    if row.get("until"):
+                        event["until"] = date.fromisoformat(row["until"])
+                    if row.get("count") or "until" not in event:
+                        event["count"] = int(row.get("count") or 1)
+                    if row.get("exceptions"):
+                        event["exceptions"] = row["exceptions"].split(";")
+            except (KeyError, ValueError):
+                raise ExchangeError(f"{path}:{number}: expected title, start_time and end_time (YYYY-MM-DD HH:MM)")
+            yield check_event(event, f"{path}:{number}")
+
+def iter_ics_lines(path):
+    """Yield (line number, logical line) from an .ics file, joining folded lines."""
+    with open(path, 'r', encoding='utf-8') as f:
+        pending, pending_number = None, 0
+        for number, line in enumerate(f, start=1):
+            line = line.rstrip("\r\n")
+            if line[:1] in (" ", "\t") and pending is not None:
+                pending += line[1:]
+                continue
+            if pending is not None:
+                yield pending_number, pending
+            pending, pending_number = line, number
+        if pending is not None:
+            yield pending_number, pending
+
+def iter_ics_events(path):
+    """Yield events from the VEVENT blocks of an .ics file."""
+    properties = None
+    for number, line in iter_ics_lines(path):
+        if line == "BEGIN:VEVENT":
+            properties, start_number = {}, number
+        elif line == "END:VEVENT" and properties is not None:
+            try:
+                event = _ics_event(properties)
+            except ExchangeError as e:
+                raise ExchangeError(f"{path}:{start_number}: {e}")
+            except (KeyError, ValueError):
+                raise ExchangeError(f"{path}:{start_number}: event needs a SUMMARY and a valid DTSTART and DTEND or DURATION")
+            properties = None
+            yield check_event(event, f"{path}:{start_number}")
+        elif properties is not None and ":" in line:
+            name, value = line.split(":", 1)
+            name, *params = name.split(";")
+            name = name.upper()
+            if name == "EXDATE":  # May be given on several lines, each with one or more dates
+                properties.setdefault(name, []).append((value, params))
+            else:
+                properties[name] = (value, params)
+
+def _ics_event(properties):
+    start, all_day = _ics_time(*properties["DTSTART"])
+    if "DTEND" in properties:
+        end, _ = _ics_time(*properties["DTEND"])
+    elif "DURATION" in properties:
+        end = start + _ics_duration(properties["DURATION"][0])
+    else:
+        end = start + (timedelta(days=1) if all_day else timedelta(0))
+    event = {
+        "title": _ics_unescape(properties["SUMMARY"][0]),
+        "start_time": start,
+        "end_time": end,
+        "recurrence": "none",
+        "completed": properties.get("STATUS", ("",))[0].upper() == "COMPLETED",
+    }
+    if "UID" in properties:
+        # Our own exports write UID:<id>@planner; a changed instance shares its series' UID
+        event["id"] = properties["UID"][0].removesuffix("@planner")
+        if "RECURRENCE-ID" in properties:
+            event["id"] += "-" + _ics_time(*properties["RECURRENCE-ID"])[0].date().isoformat()
+    if "RRULE" in properties:
+        rule = _ics_rule(properties["RRULE"][0], start)
+        event["recurrence"] = rule["FREQ"].lower()
+        if "UNTIL" in rule:
+            event["until"] = _ics_time(rule["UNTIL"], [])[0].date()
+        if "COUNT" in rule:
+            event["count"] = int(rule["COUNT"])
+        if "EXDATE" in properties:
+            event["exceptions"] = [
+                _ics_time(value, params)[0].date().isoformat()
+                for dates, params in properties["EXDATE"]
+                for value in dates.split(",")
+            ]
+    return event
+
+def _ics_rule(value, start):
+    """Split an RRULE into its parts, raising ExchangeError for a schedule the calendar cannot store.
+
+    Rules repeat every day, week or month from their start until a COUNT or
+    UNTIL; a BYDAY or BYMONTHDAY is accepted only when it names the start's own
+    day, as exporters often add.
+    """
+    rule = dict(part.upper().split("=", 1) for part in value.split(";") if "=" in part)
+    frequency = rule.pop("FREQ", "")
+    if frequency.lower() not in FREQUENCIES:
+        raise ExchangeError(f"RRULE FREQ={frequency} is not supported, only DAILY, WEEKLY or MONTHLY")
+    if rule.pop("INTERVAL", "1") != "1":
+        raise ExchangeError("RRULE INTERVAL is not supported, only rules repeating every period")
+    if "COUNT" not in rule and "UNTIL" not in rule:
+        raise ExchangeError("RRULE needs a COUNT or UNTIL, open-ended rules are not supported")
+    own_day = {"WEEKLY": ("BYDAY", ICS_WEEKDAYS[start.weekday()]), "MONTHLY": ("BYMONTHDAY", str(start.day))}.get(frequency)
+    for part, part_value in rule.items():
+        if part in ("COUNT", "UNTIL", "WKST") or (part, part_value.lstrip("+")) == own_day:
+            continue
+        raise ExchangeError(f"RRULE {part}={part_value} is not supported for FREQ={frequency}")
+    rule["FREQ"] = frequency
+    return rule
+
+def _ics_time(value, params):
+    """Parse a DTSTART/DTEND style value into a naive local datetime; returns (datetime, all_day)."""
+    if "VALUE=DATE" in params or len(value) == 8:
+        return datetime(int(value[:4]), int(value[4:6]), int(value[6:8])), True
+    if len(value) not in (15, 16) or value[8] != "T":
+        raise ValueError(f"invalid date-time '{value}'")
+    # Sliced by hand: strptime dominates the import time of large files
+    moment = datetime(int(value[:4]), int(value[4:6]), int(value[6:8]), int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    if value.endswith("Z"):
+        return moment.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None), False
+    return moment, False  # Floating or TZID time, taken as local
+
+def _ics_duration(value):
+    """Parse an iCalendar DURATION such as PT1H30M or P1D."""
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-").lstrip("P")
+    amounts = {"W": 0, "D": 0, "H": 0, "M": 0, "S": 0}
+    number = ""
+    for char in value:
+        if char.isdigit():
+            number += char
+        elif char in amounts:
+            amounts[char] = int(number)
+            number = ""
+    return sign * timedelta(weeks=amounts["W"], days=amounts["D"], hours=amounts["H"], minutes=amounts["M"], seconds=amounts["S"])
+
+def _ics_unescape(text):
+    return text.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+def _ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def check_event(event, where):
+    if not event["title"] or event["end_time"] < event["start_time"]:
+        raise ExchangeError(f"{where}: event needs a title and an end no earlier than its start")
+    return event
+
+def iter_events(path):
+    """Yield the events in an .ics or .csv file, chosen by extension."""
+    if path.lower().endswith(".ics"):
+        return iter_ics_events(path)
+    if path.lower().endswith(".csv"):
+        return iter_csv_events(path)
+    raise ExchangeError(f"{path}: only .ics and .csv files can be imported")
+
+def import_events(calendar_data, path):
+    """Append the events in path that calendar_data does not have yet; returns (added, skipped).
+
+    Events keep their UID (or CSV id) as their id, so importing a file
+    again skips the events it already added. The file is read completely
+    before anything is added, so an invalid line leaves the calendar untouched.
+    """
+    known = {event.id for event in calendar_data}
+    new_events = []
+    skipped = 0
+    for event in iter_events(path):
+        if event.get("id") in known:
+            skipped += 1
+            continue
+        event = Event(**event)
+        known.add(event.id)
+        new_events.append(event)
+    calendar_data.extend(new_events)
+    return len(new_events), skipped
+
+def flatten_overrides(calendar_data):
+    """Yield events ready for export.
+
+    Occurrences a rule overrides are exported as excluded dates of the rule
+    plus a separate single event carrying the changes, which reads back into
+    the same calendar.
+    """
+    for event in calendar_data:
+        overrides = event.overrides if is_rule(event) else None
+        if not overrides:
+            yield event
+            continue
+        exceptions = event.exceptions or []
+        yield replace(event, exceptions=exceptions + [key for key in overrides if key not in exceptions], overrides=None)
+        duration = event.end_time - event.start_time
+        for key, override in overrides.items():
+            start = override.get("start_time", datetime.combine(date.fromisoformat(key), event.start_time.time()))
+            yield Event(override.get("title", event.title), start, override.get("end_time", start + duration),
+                        completed=override.get("completed", event.completed), id=f"{event.id}-{key}")
+
+def iter_csv_lines(calendar_data):
+    """Yield CSV rows for events, header first."""
+    yield CSV_FIELDS
+    for event in flatten_overrides(calendar_data):
+        yield [
+            event["id"],
+            event["title"],
+            format_timestamp(event["start_time"]),
+            format_timestamp(event["end_time"]),
+            event["recurrence"],
+            event.get("count", ""),
+            event["until"].isoformat() if "until" in event else "",
+            ";".join(event.get("exceptions", [])),
+            "true" if event.get("completed", False) else "false",
+        ]
+
+def iter_ics_output(calendar_data):
+    """Yield the lines of an .ics file for events, folded to 75 characters."""
+    stamp = datetime.now(timezone.utc).strftime(ICS_DATETIME) + "Z"
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield "PRODID:-//planner//calendar export//EN"
+    for event in flatten_overrides(calendar_data):
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{event['id']}@planner",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{event['start_time'].strftime(ICS_DATETIME)}",
+            f"DTEND:{event['end_time'].strftime(ICS_DATETIME)}",
+            f"SUMMARY:{_ics_escape(event['title'])}",
+        ]
+        if event.get("completed", False):
+            lines.append("STATUS:COMPLETED")
+        if is_rule(event):
+            rule = f"RRULE:FREQ={event['recurrence'].upper()}"
+            if "count" in event:
+                rule += f";COUNT={event['count']}"
+            if "until" in event:
+                rule += f";UNTIL={event['until'].strftime(ICS_DATE)}T235959"
+            lines.append(rule)
+            if event.get("exceptions"):
+                time = event["start_time"].strftime("T%H%M%S")
+                lines.append("EXDATE:" + ",".join(key.replace("-", "") + time for key in event["exceptions"]))
+        lines.append("END:VEVENT")
+        for line in lines:
+            yield from _fold(line)
+    yield "END:VCALENDAR"
+
+def _fold(line):
+    while len(line) > ICS_LINE_LIMIT:
+        yield line[:ICS_LINE_LIMIT]
+        line = " " + line[ICS_LINE_LIMIT:]
+    yield line
+
+def export_events(calendar_data, path):
+    """Write events to an .ics or .csv file, chosen by extension; returns the number of records written."""
+    if path.lower().endswith(".ics"):
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            for line in iter_ics_output(calendar_data):
+                count += line == "BEGIN:VEVENT"
+                f.write(line + "\r\n")
+        return count
+    if path.lower().endswith(".csv"):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for row in iter_csv_lines(calendar_data):
+                writer.writerow(row)
+        return sum(1 for _ in flatten_overrides(calendar_data))
+    raise ExchangeError(f"{path}: events can only be exported to .ics or .csv")
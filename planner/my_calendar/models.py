@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from storage import Record, new_id
+from .timecodec import parse_timestamp, format_timestamp
+
+@dataclass(slots=True)
+class Event(Record):
+    """A calendar record: a single event, or a recurrence rule when it has a count or until."""
+    title: str
+    start_time: datetime
+    end_time: datetime
+    recurrence: str = "none"
+    completed: bool = False
+    id: str = field(default_factory=new_id)
+    task_id: str | None = None
+    count: int | None = None
+    until: date | None = None
+    exceptions: list | None = None
+    overrides: dict | None = None
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build an event from its stored form, raising ValueError if a field is missing or malformed."""
+        get = record.get
+        try:
+            event = cls(
+                str(record["title"]),
+                parse_timestamp(record["start_time"]),
+                parse_timestamp(record["end_time"]),
+                get("recurrence") or "none",
+                bool(get("completed", False)),
+                get("id") or new_id(),  # Records saved before ids existed get one now
+                get("task_id"),
+            )
+            if event.recurrence != "none":  # Only rules carry the remaining fields
+                cls._decode_rule(event, record)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"invalid event {record!r}: {e!r}")
+        if event.end_time < event.start_time:
+            raise ValueError(f"event '{event.title}' ends before it starts")
+        return event
+
+    @staticmethod
+    def _decode_rule(event, record):
+        if "count" in record:
+            event.count = int(record["count"])
+        if "until" in record:
+            event.until = date.fromisoformat(record["until"])
+        if record.get("exceptions"):
+            event.exceptions = list(record["exceptions"])
+        if record.get("overrides"):
+            event.overrides = {
+                key: {
+                    name: parse_timestamp(value) if name in ("start_time", "end_time") else value
+                    for name, value in override.items()
+                } for key, override in record["overrides"].items()
+            }
+
+    def to_dict(self):
+        """Stored form of the event; optional fields are only written when set."""
+        record = {
+            "id": self.id,
+            "title": self.title,
+            "start_time": format_timestamp(self.start_time),
+            "end_time": format_timestamp(self.end_time),
+            "recurrence": self.recurrence,
+            "completed": self.completed,
+        }
+        if self.task_id:
+            record["task_id"] = self.task_id
+        # Recurrence rule fields are only written for rules
+        if self.count is not None:
+            record["count"] = self.count
+        if self.until is not None:
+            record["until"] = self.until.isoformat()
+        if self.exceptions:
+            record["exceptions"] = self.exceptions
+        if self.overrides:
+            record["overrides"] = {
+                key: {
+                    name: format_timestamp(value) if isinstance(value, datetime) else value
+                    for name, value in override.items()
+                } for key, override in self.overrides.items()
+            }
+        return record
+
+@dataclass(slots=True)
+class Occurrence(Record):
+    """One expanded occurrence of a rule; series is the rule and occurrence its key in exceptions and overrides."""
+    title: str
+    start_time: datetime
+    end_time: datetime
+    recurrence: str
+    completed: bool
+    series: Event
+    occurrence: str
@@ -1,93 +1,153 @@
-from datetime import datetime, timedelta
-from rich.console import Console
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from ui import console
 from rich.table import Table
 import json
-import os
 import re  # Importing the 're' module for regular expressions
-
-console = Console()
+from storage import store, decode_valid
+from .event_index import get_event_index
+from .event_ids import get_event_ids
+from .models import Event
+from .exchange import ExchangeError, import_events, export_events
+from .conflicts import conflicts_between, clashes, event_clashes
+from .recurrence import FREQUENCIES, is_rule, is_occurrence, occurrence_count, first_occurrence, occurrence_key, set_occurrence_override, remove_occurrence
 
 # File to store calendar data
 CALENDAR_FILE = "calendar_data.json"
+unsaved_ids = False  # Set when events saved before ids existed were given ids, until those are saved
+
+def decode_calendar(calendar_data):
+    """Convert the JSON representation of the calendar to Event records, checking each one."""
+    global unsaved_ids
+    unsaved_ids = unsaved_ids or any(isinstance(record, dict) and not record.get("id") for record in calendar_data)
+    return decode_valid(calendar_data, Event.from_dict, "event")
+
+def encode_calendar(calendar_data):
+    """Convert in-memory events to their JSON representation."""
+    return [event.to_dict() for event in calendar_data]
+
+store.register("calendar", CALENDAR_FILE, decode=decode_calendar, encode=encode_calendar)
 
 def load_calendar():
-    """Load calendar data from a JSON file."""
-    if os.path.exists(CALENDAR_FILE):
-        try:
-            with open(CALENDAR_FILE, 'r') as f:
-                calendar_data = json.load(f)
-                for event in calendar_data:
-                    event["start_time"] = datetime.strptime(event["start_time"], "%Y-%m-%d %H:%M:%S.%f")
-                    event["end_time"] = datetime.strptime(event["end_time"], "%Y-%m-%d %H:%M:%S.%f")
-                return calendar_data
-        except (json.JSONDecodeError, ValueError) as e:
-            console.print(f"[bold red]Error loading calendar data: {e}[/bold red]")
-    return []
-
-def save_calendar(calendar_data):
-    """Save calendar data to a JSON file."""
+    """Load calendar data from the shared store."""
+    global unsaved_ids
     try:
-        with open(CALENDAR_FILE, 'w') as f:
-            json.dump([
-                {
-                    "title": event["title"],
-                    "start_time": event["start_time"].strftime("%Y-%m-%d %H:%M:%S.%f"),
-                    "end_time": event["end_time"].strftime("%Y-%m-%d %H:%M:%S.%f"),
-                    "recurrence": event["recurrence"],
-                    "completed": event.get("completed", False)  # Save completed status
-                } for event in calendar_data
-            ], f)
-    except IOError as e:
-        console.print(f"[bold red]Error saving calendar data: {e}[/bold red]")
+        calendar_data = store.get("calendar")
+    except (json.JSONDecodeError, ValueError) as e:
+        console.print(f"[bold red]Error loading calendar data: {e}[/bold red]")
+        return []
+    if unsaved_ids:
+        # Keep the new ids, so exported UIDs and task links still match on the next run
+        unsaved_ids = False
+        save_calendar(calendar_data)
+    return calendar_data
 
-def display_calendar(week_start):
+def save_calendar(calendar_data, event_ids=None):
+    """Save calendar data; it is written to disk on the next store flush.
+
+    Pass the EventIds the changes were made through to keep using it
+    instead of rebuilding it.
+    """
+    store.set("calendar", calendar_data)
+    if event_ids is not None:
+        event_ids.version = store.version("calendar")
+
+def load_event_index():
+    """Return the cached event index, rebuilt only when the calendar changes."""
+    calendar_data = load_calendar()
+    return get_event_index(calendar_data, store.version("calendar"))
+
+def load_event_ids():
+    """Return the cached indexes of events by id and by task, rebuilt only when the calendar changes."""
+    calendar_data = load_calendar()
+    return get_event_ids(calendar_data, store.version("calendar"))
+
+# Static pieces of the calendar views, built once
+PAST_STYLE = "bold white on #86575B"  # Light grey for past events
+COMPLETED_STYLE = "bold white on #D87093"  # Darker pink for completed tasks
+UPCOMING_STYLE = "bold white on #FF69B4"  # Default style for ongoing/upcoming events
+SLOT = timedelta(minutes=30)
+TIME_SLOTS = [  # From 6 AM to 12 AM
+    (timedelta(minutes=half_hour * 30), (datetime.min + timedelta(minutes=half_hour * 30)).time().strftime('%I:%M %p'))
+    for half_hour in range(6 * 2, 24 * 2)
+]
+WEEK_CACHE_SIZE = 16
+CONFLICT_WARNING_LIMIT = 5  # Overlaps listed when an event is added or changed
+
+# Rendered week tables keyed by (week start date, calendar version). Each
+# entry also records when it goes stale: the next time an event in the week
+# ends and has to be redrawn as past.
+_week_cache = OrderedDict()
+
+@lru_cache(maxsize=64)
+def day_header(day):
+    return day.strftime("%B %d\n%A")
+
+def event_block(event, ongoing_events, now, width):
+    """Markup for one cell taken by an event; the title only shows in its first cell."""
+    if event.end_time < now:
+        style = PAST_STYLE
+    elif event.completed:
+        style = COMPLETED_STYLE
+    else:
+        style = UPCOMING_STYLE
+
+    event_display = event.title
+    if event_display in ongoing_events and ongoing_events[event_display] == event.start_time:
+        return f"[{style}]{' ' * width}[/{style}]"
+    ongoing_events[event_display] = event.start_time
+    return f"[{style}]{event_display}{' ' * (width - len(event_display))}[/{style}]"
+
+def render_week(week_start):
+    """Build the weekly calendar table for the week starting on the given date, reusing cached renders."""
     calendar_data = load_calendar()
+    key = (week_start, store.version("calendar"))
+    now = datetime.now()
+    cached = _week_cache.get(key)
+    if cached and (cached[1] is None or now <= cached[1]):
+        _week_cache.move_to_end(key)
+        return cached[0]
+
+    event_index = get_event_index(calendar_data, key[1])
+    days = [datetime.combine(week_start + timedelta(days=i), datetime.min.time()) for i in range(7)]
     table = Table(title="Weekly Calendar", show_lines=True, style="bold #FC6C85")
     table.add_column("Time", style="#FC6C85", width=10)
-    days = [(week_start + timedelta(days=i)).strftime("%B %d\n%A") for i in range(7)]
     for day in days:
-        table.add_column(day, style="#FC6C85", width=20)
+        table.add_column(day_header(day.date()), style="#FC6C85", width=20)
 
     ongoing_events = {}
 
-    for half_hour in range(6 * 2, 24 * 2):  # From 6 AM to 12 AM
-        time_label = (datetime.min + timedelta(minutes=half_hour * 30)).time().strftime('%I:%M %p')
+    for offset, time_label in TIME_SLOTS:
         row = [time_label]
-        for i in range(7):
-            day = week_start + timedelta(days=i)
+        for day in days:
             block = ""
-            time_slot_start = day.replace(hour=(half_hour // 2), minute=(half_hour % 2) * 30)
-            time_slot_end = time_slot_start + timedelta(minutes=30)
-
-            for event in calendar_data:
-                if event["start_time"].date() == day.date() and event["start_time"] <= time_slot_start < event["end_time"]:
-                    event_display = event["title"]
-                    if event["end_time"] < datetime.now():
-                        style = "bold white on #86575B"  # Light grey for past events
-                    elif event.get("completed", False):
-                        style = "bold white on #D87093"  # Darker pink for completed tasks
-                    else:
-                        style = "bold white on #FF69B4"  # Default style for ongoing/upcoming events
-
-                    if event_display in ongoing_events and ongoing_events[event_display] == event["start_time"]:
-                        block = f"[{style}]{' ' * 18}[/{style}]"
-                    else:
-                        block = f"[{style}]{event_display}{' ' * (18 - len(event_display))}[/{style}]"
-                        ongoing_events[event_display] = event["start_time"]
-                    break
-
+            time_slot_start = day + offset
+            for event in event_index.overlapping(time_slot_start, time_slot_start + SLOT):
+                block = event_block(event, ongoing_events, now, 18)
+                break
             row.append(block)
         table.add_row(*row)
-    
-    console.print(table)
+
+    week_events = event_index.overlapping(days[0], days[-1] + timedelta(days=1))
+    valid_until = min((event.end_time for event in week_events if event.end_time >= now), default=None)
+    _week_cache[key] = (table, valid_until)
+    if len(_week_cache) > WEEK_CACHE_SIZE:
+        _week_cache.popitem(last=False)
+    return table
+
+def display_calendar(week_start):
+    console.print(render_week(week_start.date() if isinstance(week_start, datetime) else week_start))
 
 def display_today():
     """Display today's calendar events and tasks."""
     from tasks.tasks import load_tasks  # Local import to avoid circular dependency
 
-    calendar_data = load_calendar()
+    event_index = load_event_index()
     tasks_data = load_tasks()
-    today = datetime.now().date()
+    now = datetime.now()
+    today = now.date()
+    day = datetime.combine(today, datetime.min.time())
 
     # Create a table for today's schedule
     table = Table(title=f"Today's Schedule - {today.strftime('%B %d, %Y')}", show_lines=True, style="bold #FC6C85")
@@ -96,28 +156,12 @@ def display_today():
 
     ongoing_events = {}
 
-    for half_hour in range(6 * 2, 24 * 2):  # From 6 AM to 12 AM
-        time_label = (datetime.min + timedelta(minutes=half_hour * 30)).time().strftime('%I:%M %p')
-        time_slot_start = datetime.combine(today, (datetime.min + timedelta(minutes=half_hour * 30)).time())
-        time_slot_end = time_slot_start + timedelta(minutes=30)
-
+    for offset, time_label in TIME_SLOTS:
+        time_slot_start = day + offset
         block = ""
-        for event in calendar_data:
-            if event["start_time"].date() == today and event["start_time"] <= time_slot_start < event["end_time"]:
-                event_display = event["title"]
-                if event["end_time"] < datetime.now():
-                    style = "bold white on #86575B"  # Light grey for past events
-                elif event.get("completed", False):
-                    style = "bold white on #D87093"  # Darker pink for completed tasks
-                else:
-                    style = "bold white on #FF69B4"  # Default style for ongoing/upcoming events
-
-                if event_display in ongoing_events and ongoing_events[event_display] == event["start_time"]:
-                    block = f"[{style}]{' ' * 28}[/{style}]"
-                else:
-                    block = f"[{style}]{event_display}{' ' * (28 - len(event_display))}[/{style}]"
-                    ongoing_events[event_display] = event["start_time"]
-                break
+        for event in event_index.overlapping(time_slot_start, time_slot_start + SLOT):
+            block = event_block(event, ongoing_events, now, 28)
+            break
 
         table.add_row(time_label, block)
 
@@ -144,115 +188,256 @@ def add_event():
     duration = int(console.input("[#FC6C85]Enter event duration in minutes: [/#FC6C85]"))
     recurrence = console.input("[#FC6C85]Recurrence (none, daily, weekly, monthly) (default: none): [/#FC6C85]") or "none"
     recurrence_weeks = int(console.input("[#FC6C85]Number of weeks to recur (default: 4): [/#FC6C85]") or 4)
+    if duration <= 0:
+        console.print("[bold red]Duration must be a positive number of minutes![/bold red]")
+        return
 
     try:
-        day, time = re.match(r"(\w+)\s+(\d{1,2}:\d{2}\s*[APMapm]{2})", day_time).groups()
-        time = datetime.strptime(time, "%I:%M %p").time()
-        days_of_week = {"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6}
-        week_start = datetime.now() - timedelta(days=datetime.now().weekday())
-        event_day = week_start + timedelta(days=days_of_week[day.capitalize()])
-        start_time = datetime.combine(event_day, time)
+        start_time = parse_day_time(day_time)
         end_time = start_time + timedelta(minutes=duration)
 
-        for _ in range(recurrence_weeks):
-            calendar_data.append({"title": title, "start_time": start_time, "end_time": end_time, "recurrence": recurrence})
-            if recurrence == "daily":
-                start_time += timedelta(days=1)
-                end_time += timedelta(days=1)
-            elif recurrence == "weekly":
-                start_time += timedelta(weeks=1)
-                end_time += timedelta(weeks=1)
-            elif recurrence == "monthly":
-                start_time = start_time.replace(month=(start_time.month % 12) + 1)
-                end_time = end_time.replace(month=(end_time.month % 12) + 1)
-            else:
-                break
+        event = Event(title, start_time, end_time, recurrence)
+        if recurrence in FREQUENCIES:
+            # Stored once as a rule; occurrences are expanded when displayed
+            event.count = recurrence_weeks
+        warn_conflicts(event_clashes(load_event_index(), event))
+        calendar_data.append(event)
 
         save_calendar(calendar_data)
         console.print("[bold #FC6C85]Event added successfully![/bold #FC6C85]")
-    except (ValueError, AttributeError):
+    except (ValueError, AttributeError, KeyError):
         console.print("[bold red]Invalid day and time format! Please use the format: Monday 5:30 PM[/bold red]")
 
+def parse_day_time(day_time):
+    """Turn input like 'Monday 5:30 PM' into a datetime in the current week."""
+    day, time = re.match(r"(\w+)\s+(\d{1,2}:\d{2}\s*[APMapm]{2})", day_time).groups()
+    time = datetime.strptime(time, "%I:%M %p").time()
+    days_of_week = {"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6}
+    week_start = datetime.now() - timedelta(days=datetime.now().weekday())
+    event_day = week_start + timedelta(days=days_of_week[day.capitalize()])
+    return datetime.combine(event_day, time)
+
 def modify_event():
-    """Modify an existing event."""
+    """Modify an existing event, or a single occurrence of a recurring event."""
     calendar_data = load_calendar()
-    display_event_list()
+    groups = display_event_list(calendar_data)
     try:
         event_id = int(console.input("[#FC6C85]Enter event ID to modify: [/#FC6C85]"))
-        if 0 <= event_id < len(calendar_data):
-            title = console.input("[#FC6C85]New event title: [/#FC6C85]") or calendar_data[event_id]["title"]
+        if 0 <= event_id < len(groups):
+            group = groups[event_id]
+            event = group[0]
+            occurrence = None
+            if is_rule(event) or len(group) > 1:
+                occurrence_date = console.input("[#FC6C85]Date of the single occurrence to change (YYYY-MM-DD) or leave empty for the whole series: [/#FC6C85]").strip()
+                if occurrence_date:
+                    occurrence = occurrence_key(datetime.strptime(occurrence_date, "%Y-%m-%d"))
+                    if is_rule(event):
+                        found = is_occurrence(event, occurrence)
+                    else:
+                        # A saved copy is changed as a single event of its own
+                        group = [copy for copy in group if occurrence_key(copy["start_time"]) == occurrence]
+                        found, occurrence = bool(group), None
+                    if not found:
+                        console.print(f"[bold red]'{event['title']}' has no occurrence on {occurrence_date}![/bold red]")
+                        return
+                    event = group[0]
+
+            title = console.input("[#FC6C85]New event title: [/#FC6C85]") or event["title"]
             day_time = console.input("[#FC6C85]New day and time (e.g., Monday 5:30 PM): [/#FC6C85]")
             duration = console.input("[#FC6C85]New event duration in minutes: [/#FC6C85]")
-            recurrence = console.input("[#FC6C85]New recurrence (none, daily, weekly, monthly) (default: none): [/#FC6C85]") or calendar_data[event_id]["recurrence"]
-
-            if day_time:
-                day, time = re.match(r"(\w+)\s+(\d{1,2}:\d{2}\s*[APMapm]{2})", day_time).groups()
-                time = datetime.strptime(time, "%I:%M %p").time()
-                days_of_week = {"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6}
-                week_start = datetime.now() - timedelta(days=datetime.now().weekday())
-                event_day = week_start + timedelta(days=days_of_week[day.capitalize()])
-                start_time = datetime.combine(event_day, time)
-                calendar_data[event_id]["start_time"] = start_time
-
-                if duration:
-                    end_time = start_time + timedelta(minutes=int(duration))
-                    calendar_data[event_id]["end_time"] = end_time
-
-            calendar_data[event_id]["title"] = title
-            calendar_data[event_id]["recurrence"] = recurrence
+            if duration and int(duration) <= 0:
+                console.print("[bold red]Duration must be a positive number of minutes![/bold red]")
+                return
+
+            if occurrence:
+                completed = console.input("[#FC6C85]Mark this occurrence as completed? (yes/no) (default: no): [/#FC6C85]").strip().lower() == "yes"
+                fields = {"title": title, "completed": completed}
+                if day_time or duration:
+                    current = event.get("overrides", {}).get(occurrence, {})
+                    start_time = current.get("start_time", datetime.combine(datetime.fromisoformat(occurrence).date(), event["start_time"].time()))
+                    if day_time:
+                        start_time = parse_day_time(day_time)
+                    minutes = int(duration) if duration else (event["end_time"] - event["start_time"]).total_seconds() // 60
+                    fields["start_time"] = start_time
+                    fields["end_time"] = start_time + timedelta(minutes=minutes)
+                set_occurrence_override(event, occurrence, **fields)
+                if "start_time" in fields:
+                    moved = dict(event, start_time=fields["start_time"], end_time=fields["end_time"], title=title)
+                    warn_conflicts([(moved, other) for other in clashes(load_event_index(), fields["start_time"], fields["end_time"], event, occurrence)])
+            else:
+                recurrence = console.input("[#FC6C85]New recurrence (none, daily, weekly, monthly) (default: none): [/#FC6C85]") or event["recurrence"]
+                shift = timedelta(0)
+                if day_time:
+                    new_start = parse_day_time(day_time)
+                    if len(group) > 1:
+                        # Saved copies all move by the step that takes the first one to the new day and time of its own week
+                        new_start = datetime.combine(event["start_time"].date() + timedelta(days=new_start.weekday() - event["start_time"].weekday()), new_start.time())
+                    shift = new_start - event["start_time"]
+                times = []
+                for record in group:
+                    start_time, end_time = record["start_time"] + shift, record["end_time"] + shift
+                    if duration:
+                        end_time = start_time + timedelta(minutes=int(duration))
+                    times.append((start_time, end_time))
+
+                # All input is parsed; the stored records are the live cached ones, so only change them now
+                for record, (start_time, end_time) in zip(group, times):
+                    record["start_time"] = start_time
+                    record["end_time"] = end_time
+                    record["title"] = title
+                    record["recurrence"] = recurrence
+                    if recurrence not in FREQUENCIES:
+                        for key in ("count", "until", "exceptions", "overrides"):
+                            record.pop(key, None)
+                if day_time or duration:
+                    warn_conflicts([pair for record in group for pair in event_clashes(load_event_index(), record)])
 
             save_calendar(calendar_data)
             console.print("[bold #FC6C85]Event modified successfully![/bold #FC6C85]")
         else:
             console.print("[bold red]Invalid event ID![/bold red]")
-    except ValueError:
+    except (ValueError, AttributeError, KeyError):
         console.print("[bold red]Invalid input! Please enter a valid event ID.[/bold red]")
+
 def remove_event():
     """Remove an event from the calendar."""
-    calendar_data = load_calendar()
-    unique_events = {}
-
-    # Group events by title, only keeping the first instance of each recurring event
-    for event in calendar_data:
-        if event["title"] not in unique_events:
-            unique_events[event["title"]] = event
-
-    # Display the unique events
-    for i, (title, event) in enumerate(unique_events.items()):
-        console.print(f"[{i}] {event['title']} on {event['start_time'].strftime('%A %I:%M %p')} to {event['end_time'].strftime('%I:%M %p')}")
+    event_ids = load_event_ids()
+    groups = display_event_list(event_ids.calendar_data)
 
     try:
         event_id = int(console.input("[#FC6C85]Enter event ID to remove: [/#FC6C85]"))
-        title_to_remove = list(unique_events.keys())[event_id]
+        group = groups[event_id]
+        event = group[0]
 
-        # Find all events with the same title
-        events_to_remove = [event for event in calendar_data if event["title"] == title_to_remove]
+        # A rule, or a run of saved weekly copies, stands for several occurrences
+        occurrences = sum(occurrence_count(record) for record in group)
 
-        if len(events_to_remove) > 1:
-            console.print(f"[bold yellow]This event has {len(events_to_remove)} occurrences.[/bold yellow]")
+        if occurrences > 1:
+            console.print(f"[bold yellow]This event has {occurrences} occurrences.[/bold yellow]")
             remove_choice = console.input("[#FC6C85]Do you want to remove all occurrences? (yes/no): [/#FC6C85]").strip().lower()
 
             if remove_choice == "yes":
-                calendar_data = [event for event in calendar_data if event["title"] != title_to_remove]
+                for record in group:
+                    event_ids.remove(record["id"])
             else:
                 console.print(f"[bold yellow]Removing only the first occurrence.[/bold yellow]")
-                calendar_data.remove(events_to_remove[0])
+                remove_first_occurrence(event_ids, event)
         else:
-            calendar_data.remove(events_to_remove[0])
+            event_ids.remove(event["id"])
 
-        save_calendar(calendar_data)
+        save_calendar(event_ids.calendar_data, event_ids)
         console.print("[bold #FC6C85]Event removed successfully![/bold #FC6C85]")
     except (ValueError, IndexError):
         console.print("[bold red]Invalid input! Please enter a valid event ID.[/bold red]")
 
-def display_event_list():
-    """Display a list of all events, grouping recurring events by title."""
+def remove_first_occurrence(event_ids, event):
+    """Remove a single event, or the first remaining occurrence of a rule."""
+    if not is_rule(event):
+        event_ids.remove(event["id"])
+        return
+    occurrence = first_occurrence(event)
+    if occurrence is not None:
+        remove_occurrence(event, occurrence.occurrence)
+    if first_occurrence(event) is None:
+        event_ids.remove(event["id"])
+
+def event_groups(calendar_data):
+    """Group calendar records into the entries of the event list, in order of their first start.
+
+    Rules and single events are entries of their own. Older versions saved a
+    recurring event as one record per week, with its frequency but no count
+    or until; those copies are grouped by title and frequency.
+    """
+    groups = []
+    copies = {}
+    for event in sorted(calendar_data, key=lambda event: event["start_time"]):
+        if event["recurrence"] in FREQUENCIES and not is_rule(event):
+            key = (event["title"], event["recurrence"])
+            if key not in copies:
+                copies[key] = []
+                groups.append(copies[key])
+            copies[key].append(event)
+        else:
+            groups.append([event])
+    return groups
+
+def display_event_list(calendar_data=None):
+    """Display the calendar's events in start order and return them as groups of records.
+
+    A recurring event is listed once, as its rule or as its saved weekly copies.
+    """
+    if calendar_data is None:
+        calendar_data = load_calendar()
+    groups = event_groups(calendar_data)
+
+    for i, group in enumerate(groups):
+        event = group[0]
+        if "count" in event:
+            repeats = f" ({event['recurrence']} x{event['count']})"
+        elif len(group) > 1:
+            repeats = f" ({event['recurrence']}, {len(group)} saved occurrences until {group[-1]['start_time'].strftime('%b %d %Y')})"
+        else:
+            repeats = ""
+        console.print(f"[{i}] {event['title']} on {event['start_time'].strftime('%a %b %d %I:%M %p')} to {event['end_time'].strftime('%I:%M %p')}{repeats}")
+    return groups
+
+def describe_time(event):
+    return f"{event['start_time'].strftime('%a %b %d %I:%M %p')} - {event['end_time'].strftime('%I:%M %p')}"
+
+def warn_conflicts(pairs):
+    """Print a warning for each (event, other) pair of overlapping events, up to CONFLICT_WARNING_LIMIT."""
+    for event, other in pairs[:CONFLICT_WARNING_LIMIT]:
+        console.print(f"[bold yellow]Warning: '{event['title']}' ({describe_time(event)}) overlaps '{other['title']}' ({describe_time(other)}).[/bold yellow]")
+    if len(pairs) > CONFLICT_WARNING_LIMIT:
+        console.print(f"[bold yellow]...and {len(pairs) - CONFLICT_WARNING_LIMIT} more overlaps.[/bold yellow]")
+
+def display_conflicts():
+    """List every pair of overlapping events between two dates."""
+    week_start = date.today() - timedelta(days=date.today().weekday())
+    try:
+        first = console.input(f"[#FC6C85]From date (YYYY-MM-DD) (default: {week_start.isoformat()}): [/#FC6C85]").strip()
+        first = date.fromisoformat(first) if first else week_start
+        last = console.input(f"[#FC6C85]To date (YYYY-MM-DD) (default: {(first + timedelta(days=6)).isoformat()}): [/#FC6C85]").strip()
+        last = date.fromisoformat(last) if last else first + timedelta(days=6)
+    except ValueError:
+        console.print("[bold red]Invalid date! Please use the format YYYY-MM-DD.[/bold red]")
+        return
+
+    t0 = datetime.combine(first, datetime.min.time())
+    pairs = conflicts_between(load_event_index(), t0, datetime.combine(last, datetime.min.time()) + timedelta(days=1))
+    if not pairs:
+        console.print(f"[bold #FC6C85]No overlapping events between {first.isoformat()} and {last.isoformat()}.[/bold #FC6C85]")
+        return
+
+    table = Table(title=f"Conflicts {first.isoformat()} to {last.isoformat()}", show_lines=True, style="bold #FC6C85")
+    table.add_column("Event", style="#FC6C85")
+    table.add_column("Time", style="#FC6C85")
+    table.add_column("Overlaps", style="#FC6C85")
+    table.add_column("Time", style="#FC6C85")
+    for event, other in pairs:
+        table.add_row(event["title"], describe_time(event), other["title"], describe_time(other))
+    console.print(table)
+
+def import_calendar():
+    """Add every event from an .ics or .csv file to the calendar."""
+    path = console.input("[#FC6C85]File to import (.ics or .csv): [/#FC6C85]").strip()
     calendar_data = load_calendar()
-    unique_events = {}
-    
-    for i, event in enumerate(calendar_data):
-        if event["title"] not in unique_events:
-            unique_events[event["title"]] = event
-    
-    for i, (title, event) in enumerate(unique_events.items()):
-        console.print(f"[{i}] {event['title']} on {event['start_time'].strftime('%A %I:%M %p')} to {event['end_time'].strftime('%I:%M %p')}")
+    try:
+        count, skipped = import_events(calendar_data, path)
+    except (ExchangeError, OSError) as e:
+        console.print(f"[bold red]Import failed: {e}[/bold red]")
+        return
+    save_calendar(calendar_data)
+    console.print(f"[bold #FC6C85]Imported {count} events![/bold #FC6C85]")
+    if skipped:
+        console.print(f"[bold yellow]Skipped {skipped} events already in the calendar.[/bold yellow]")
+
+def export_calendar():
+    """Write every event to an .ics or .csv file."""
+    path = console.input("[#FC6C85]File to export to (.ics or .csv): [/#FC6C85]").strip()
+    try:
+        count = export_events(load_calendar(), path)
+    except (ExchangeError, OSError) as e:
+        console.print(f"[bold red]Export failed: {e}[/bold red]")
+        return
+    console.print(f"[bold #FC6C85]Exported {count} events to {path}![/bold #FC6C85]")
@@ -0,0 +1,163 @@
+import calendar
+from datetime import datetime, timedelta
+from .models import Occurrence
+
+# Recurring events are stored once as a rule and expanded only for the window
+# being displayed or scheduled. A rule is an event record with a recurrence
+# frequency plus "count" and/or "until"; legacy records without either are
+# single, already materialised occurrences.
+FREQUENCIES = ("daily", "weekly", "monthly")
+STEPS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+
+def is_rule(event):
+    """Return True if the event is a recurrence rule rather than a single occurrence."""
+    return event.recurrence in FREQUENCIES and (event.count is not None or event.until is not None)
+
+def add_months(moment, months):
+    """Shift a datetime by whole months, clamping the day to the target month's length."""
+    year, month = divmod(moment.month - 1 + months, 12)
+    year += moment.year
+    month += 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+def occurrence_start(event, n):
+    """Return the start time of the n-th occurrence of a rule (0-based)."""
+    if event.recurrence == "monthly":
+        return add_months(event.start_time, n)
+    return event.start_time + STEPS[event.recurrence] * n
+
+def occurrence_key(start_time):
+    """Key identifying an occurrence in a rule's exceptions and overrides."""
+    return start_time.date().isoformat()
+
+def _in_rule(event, n, start_time):
+    if event.count is not None and n >= event.count:
+        return False
+    if event.until is not None and start_time.date() > event.until:
+        return False
+    return True
+
+def is_occurrence(event, key):
+    """Return True if the rule has an occurrence, not excluded, on the day given as an occurrence key."""
+    if key in (event.exceptions or ()):
+        return False
+    try:
+        day = datetime.fromisoformat(key).date()
+    except ValueError:
+        return False
+    start = event.start_time
+    if event.recurrence == "monthly":
+        n = (day.year - start.year) * 12 + day.month - start.month
+    else:
+        steps, remainder = divmod((day - start.date()).days, STEPS[event.recurrence].days)
+        if remainder:
+            return False
+        n = steps
+    if n < 0:
+        return False
+    start_time = occurrence_start(event, n)
+    return start_time.date() == day and _in_rule(event, n, start_time)
+
+def last_occurrence_end(event):
+    """Return the end of the rule's final occurrence, or None if it is unbounded."""
+    duration = event.end_time - event.start_time
+    if event.count is not None:
+        last = occurrence_start(event, max(event.count - 1, 0))
+        if event.until is not None and last.date() > event.until:
+            last = _last_start_before(event, event.until)
+        return last + duration
+    if event.until is not None:
+        return _last_start_before(event, event.until) + duration
+    return None
+
+def _last_start_before(event, until):
+    start = event.start_time
+    if event.recurrence == "monthly":
+        n = (until.year - start.year) * 12 + until.month - start.month
+    else:
+        n = (until - start.date()).days // STEPS[event.recurrence].days
+    n = max(n, 0)
+    while n > 0 and occurrence_start(event, n).date() > until:
+        n -= 1
+    return occurrence_start(event, n)
+
+def _first_candidate(event, window_start, duration):
+    """Index of the first occurrence that could still be running at window_start."""
+    start = event.start_time
+    earliest = window_start - duration
+    if earliest <= start:
+        return 0
+    if event.recurrence == "monthly":
+        n = (earliest.year - start.year) * 12 + earliest.month - start.month - 1
+    else:
+        n = (earliest - start) // STEPS[event.recurrence]
+    return max(n, 0)
+
+def _occurrence(event, start_time, end_time, key, override=None):
+    # Times an override moves the occurrence to are already in start_time and end_time
+    if override:
+        return Occurrence(override.get("title", event.title), start_time, end_time, event.recurrence,
+                          override.get("completed", event.completed), event, key)
+    return Occurrence(event.title, start_time, end_time, event.recurrence, event.completed, event, key)
+
+def expand_event(event, window_start, window_end):
+    """Yield the occurrences of a rule overlapping [window_start, window_end), in start order."""
+    duration = event.end_time - event.start_time
+    exceptions = set(event.exceptions or ())
+    overrides = event.overrides or {}
+    moved = []
+
+    n = _first_candidate(event, window_start, duration)
+    while True:
+        start_time = occurrence_start(event, n)
+        if start_time >= window_end or not _in_rule(event, n, start_time):
+            break
+        key = occurrence_key(start_time)
+        override = overrides.get(key)
+        if key not in exceptions and start_time + duration > window_start:
+            if override and ("start_time" in override or "end_time" in override):
+                pass  # Rescheduled occurrences are placed by their override below
+            else:
+                yield _occurrence(event, start_time, start_time + duration, key, override)
+        n += 1
+
+    # Occurrences moved by an override can land outside their original slot
+    for key, override in overrides.items():
+        if key in exceptions or not ("start_time" in override or "end_time" in override):
+            continue
+        if not is_occurrence(event, key):
+            continue  # Overrides for days the rule never reaches are ignored
+        original = datetime.combine(datetime.fromisoformat(key).date(), event.start_time.time())
+        start_time = override.get("start_time", original)
+        end_time = override.get("end_time", start_time + duration)
+        if start_time < window_end and end_time > window_start:
+            moved.append(_occurrence(event, start_time, end_time, key, override))
+    yield from sorted(moved, key=lambda occurrence: occurrence.start_time)
+
+def occurrence_count(event):
+    """Number of occurrences a stored record stands for (1 for single events)."""
+    if not is_rule(event):
+        return 1
+    if event.count is not None and event.until is None:
+        return max(event.count - len(event.exceptions or ()), 0)
+    end = last_occurrence_end(event)
+    return sum(1 for _ in expand_event(event, event.start_time, end))
+
+def first_occurrence(event):
+    """Return the first remaining occurrence of a record, or None if every occurrence was removed."""
+    if not is_rule(event):
+        return event
+    end = last_occurrence_end(event)
+    return next(iter(expand_event(event, event.start_time, end)), None)
+
+def set_occurrence_override(event, key, **fields):
+    """Record per-occurrence changes (completion, title, times) on a rule."""
+    event.setdefault("overrides", {}).setdefault(key, {}).update(fields)
+
+def remove_occurrence(event, key):
+    """Exclude a single occurrence from a rule."""
+    exceptions = event.setdefault("exceptions", [])
+    if key not in exceptions:
+        exceptions.append(key)
+    event.get("overrides", {}).pop(key, None)
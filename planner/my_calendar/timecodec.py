@@ -0,0 +1,26 @@
+from datetime import datetime
+
+# On-disk format of calendar timestamps, e.g. "2024-08-02 19:00:38.294611"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+# Older files sometimes omit the microseconds
+LEGACY_FORMATS = (TIMESTAMP_FORMAT, "%Y-%m-%d %H:%M:%S")
+
+def parse_timestamp(value):
+    """Parse a stored calendar timestamp.
+
+    datetime.fromisoformat is implemented in C and handles the stored format
+    directly, so the slow strptime path is only taken for unexpected input.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        for fmt in LEGACY_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                pass
+        raise
+
+def format_timestamp(moment):
+    """Format a datetime in the stored calendar format."""
+    return moment.isoformat(sep=" ", timespec="microseconds")
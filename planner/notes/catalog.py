@@ -0,0 +1,109 @@
+import os
+
+class NotesCatalog:
+    """Cached tree of note folders under a root directory.
+
+    Each directory's listing is kept together with the directory's mtime, so
+    a refresh costs one stat per directory and only lists directories whose
+    contents changed. Listings use os.scandir, whose entries already know
+    whether they are files or folders, and keep each note's size and mtime
+    so counts and sizes never need the files reopened.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._dirs = {}  # path -> (mtime_ns, [folder names], {note name: (size, mtime_ns)})
+
+    def refresh(self):
+        """Bring the cached tree up to date with the disk and return the catalog."""
+        seen = set()
+        if os.path.isdir(self.root):
+            self._scan(self.root, seen)
+        for path in [path for path in self._dirs if path not in seen]:
+            del self._dirs[path]
+        return self
+
+    def _scan(self, path, seen):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        seen.add(path)
+        cached = self._dirs.get(path)
+        if cached is None or cached[0] != mtime:
+            folders, notes = [], {}
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        folders.append(entry.name)
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        stat = entry.stat()
+                        notes[entry.name] = (stat.st_size, stat.st_mtime_ns)
+            cached = (mtime, sorted(folders), notes)
+            self._dirs[path] = cached
+        for folder in cached[1]:
+            self._scan(os.path.join(path, folder), seen)
+
+    def update_note(self, file_path):
+        """Re-read the size and mtime of one note, e.g. after it was edited in place."""
+        folder, name = os.path.split(file_path)
+        cached = self._dirs.get(folder)
+        if cached is None:
+            return
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            cached[2].pop(name, None)
+            return
+        cached[2][name] = (stat.st_size, stat.st_mtime_ns)
+
+    def folders(self, folder=""):
+        """Names of the folders directly inside folder (relative to the root)."""
+        cached = self._dirs.get(self._path(folder))
+        return list(cached[1]) if cached else []
+
+    def notes(self, folder=""):
+        """Map note names directly inside folder to (size, mtime_ns)."""
+        cached = self._dirs.get(self._path(folder))
+        return dict(cached[2]) if cached else {}
+
+    def walk(self, folder=""):
+        """Yield (relative folder, folder names, notes) for folder and everything below it, depth first."""
+        cached = self._dirs.get(self._path(folder))
+        if cached is None:
+            return
+        yield folder, cached[1], cached[2]
+        for name in cached[1]:
+            yield from self.walk(os.path.join(folder, name) if folder else name)
+
+    def note_paths(self):
+        """Yield the path of every note in the catalog."""
+        for folder, _, notes in self.walk():
+            for name in notes:
+                yield os.path.join(self._path(folder), name)
+
+    def totals(self, folder=""):
+        """Return (note count, total bytes) for folder and its subfolders."""
+        count = size = 0
+        for _, _, notes in self.walk(folder):
+            count += len(notes)
+            size += sum(note_size for note_size, _ in notes.values())
+        return count, size
+
+    def _path(self, folder):
+        return os.path.join(self.root, folder) if folder else self.root
+
+_catalogs = {}
+
+def get_catalog(root):
+    """Return the refreshed catalog for root, reusing the cached tree between calls."""
+    if root not in _catalogs:
+        _catalogs[root] = NotesCatalog(root)
+    return _catalogs[root].refresh()
+
+def format_size(size):
+    """Human-readable size, e.g. 512 B or 4.2 KB."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
@@ -1,17 +1,17 @@
 import os
 import subprocess
-from rich.console import Console
+from ui import console
+from rich.table import Table
 from rich.tree import Tree
+from notes.catalog import get_catalog, format_size
+from notes.search import search
 
-console = Console()
-notes_directory = "notes_files"  # Directory to store notes
-
-# Ensure the notes directory exists
-os.makedirs(notes_directory, exist_ok=True)
+notes_directory = "notes_files"  # Directory to store notes; created with the first folder
 
 def display_folders():
     """Display all folders."""
-    folders = [f for f in os.listdir(notes_directory) if os.path.isdir(os.path.join(notes_directory, f))]
+    catalog = get_catalog(notes_directory)
+    folders = [folder for folder, _, _ in catalog.walk() if folder]
     if not folders:
         console.print("[bold #FC6C85]No folders available.[/bold #FC6C85]")
         return
@@ -22,18 +22,21 @@ def display_folders():
 
 def display_notes_tree():
     """Display all folders and notes in a tree format."""
+    catalog = get_catalog(notes_directory)
     tree = Tree("[bold #FC6C85]Notes[/bold #FC6C85]")
-    folders = [f for f in os.listdir(notes_directory) if os.path.isdir(os.path.join(notes_directory, f))]
-    
-    for folder in folders:
-        folder_node = tree.add(f"[bold magenta]{folder}[/bold magenta]")
-        folder_path = os.path.join(notes_directory, folder)
-        notes = [f for f in os.listdir(folder_path) if f.endswith('.md')]
-        for note in notes:
-            folder_node.add(note[:-3])
-    
+    add_tree_nodes(tree, catalog, "")
     console.print(tree)
 
+def add_tree_nodes(node, catalog, folder):
+    """Add the subfolders and notes of folder under node, recursing into subfolders."""
+    for name in catalog.folders(folder):
+        path = os.path.join(folder, name) if folder else name
+        count, size = catalog.totals(path)
+        folder_node = node.add(f"[bold magenta]{name}[/bold magenta] [dim]({count} note{'s' if count != 1 else ''}, {format_size(size)})[/dim]")
+        add_tree_nodes(folder_node, catalog, path)
+    for note, (size, _) in sorted(catalog.notes(folder).items()):
+        node.add(f"{note[:-3]} [dim]({format_size(size)})[/dim]")
+
 def new_folder():
     """Add a new folder."""
     folder = console.input("[#FC6C85]Folder name: [/#FC6C85]")
@@ -68,6 +71,7 @@ def open_note_in_editor(file_path):
     try:
         editor = os.environ.get('EDITOR', 'nano')  # Use 'nano' editor by default
         subprocess.run([editor, file_path])
+        get_catalog(notes_directory).update_note(file_path)
     except Exception as e:
         console.print(f"[bold red]Failed to open editor: {e}[/bold red]")
 
@@ -81,7 +85,7 @@ def modify_note():
         return
 
     # Display available notes in the selected folder
-    notes = [f[:-3] for f in os.listdir(folder_path) if f.endswith('.md')]
+    notes = [note[:-3] for note in sorted(get_catalog(notes_directory).notes(folder))]
     if not notes:
         console.print("[bold red]No notes found in this folder.[/bold red]")
         return
@@ -142,3 +146,22 @@ def delete_folder():
         console.print("[bold #FC6C85]Folder deleted successfully![/bold #FC6C85]")
     else:
         console.print("[bold #FC6C85]Folder deletion canceled.[/bold #FC6C85]")
+
+def search_notes():
+    """Search the text of all notes and list the best matches."""
+    query = console.input("[#FC6C85]Search for: [/#FC6C85]").strip()
+    if not query:
+        console.print("[bold red]Please enter something to search for.[/bold red]")
+        return
+
+    hits = search(query, notes_directory)
+    if not hits:
+        console.print("[bold #FC6C85]No matching notes found.[/bold #FC6C85]")
+        return
+
+    table = Table(title="Search Results", style="#FC6C85")
+    table.add_column("Note", style="bold magenta")
+    table.add_column("Match", style="white")
+    for path, score, snippet in hits:
+        table.add_row(os.path.relpath(path, notes_directory)[:-3], snippet)
+    console.print(table)
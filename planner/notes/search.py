@@ -0,0 +1,109 @@
+import math
+import os
+import re
+from storage import store
+from notes.catalog import get_catalog
+
+INDEX_FILE = "notes_index.json"
+SNIPPET_RADIUS = 40
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# The index is stored per note: {path: {"mtime": ..., "size": ..., "tokens": {token: [offsets]}}}
+# so a changed note only rewrites its own entry. The token -> note postings
+# used for lookups are built from it in memory once per index version.
+store.register("notes_index", INDEX_FILE, default=dict)
+
+_postings = None
+_postings_version = None
+
+def tokenize(text):
+    """Map each lowercase word in text to the character offsets it occurs at."""
+    tokens = {}
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        tokens.setdefault(match.group(), []).append(match.start())
+    return tokens
+
+def iter_note_files(notes_directory):
+    """Yield (path, mtime_ns, size) for every .md note under notes_directory."""
+    # A note edited in place does not change its folder's mtime, so the
+    # catalog supplies the paths but each note is still stat'ed here
+    for path in get_catalog(notes_directory).note_paths():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        yield path, stat.st_mtime_ns, stat.st_size
+
+def update_index(notes_directory):
+    """Re-index notes whose mtime or size changed and drop deleted ones; return the number of changes."""
+    index = store.get("notes_index")
+    seen = set()
+    changes = 0
+    for path, mtime, size in iter_note_files(notes_directory):
+        seen.add(path)
+        entry = index.get(path)
+        if entry and entry["mtime"] == mtime and entry["size"] == size:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                tokens = tokenize(f.read())
+        except OSError:
+            continue
+        index[path] = {"mtime": mtime, "size": size, "tokens": tokens}
+        changes += 1
+    for path in [path for path in index if path not in seen]:
+        del index[path]
+        changes += 1
+    if changes:
+        store.set("notes_index", index)
+    return changes
+
+def postings():
+    """Return the in-memory inverted index: token -> {path: offsets}."""
+    global _postings, _postings_version
+    index = store.get("notes_index")
+    version = store.version("notes_index")
+    if _postings is None or version != _postings_version:
+        _postings = {}
+        for path, entry in index.items():
+            for token, offsets in entry["tokens"].items():
+                _postings.setdefault(token, {})[path] = offsets
+        _postings_version = version
+    return _postings
+
+def search(query, notes_directory, limit=10):
+    """Return up to limit (path, score, snippet) hits for notes containing every word of query.
+
+    Hits are ranked by tf-idf, and snippets are only read for the hits returned.
+    """
+    update_index(notes_directory)
+    terms = list(tokenize(query))
+    if not terms:
+        return []
+    index = postings()
+    matches = [index.get(term, {}) for term in terms]
+    if not all(matches):
+        return []
+
+    total = len(store.get("notes_index"))
+    candidates = set.intersection(*(set(match) for match in sorted(matches, key=len)))
+    scores = {}
+    for path in candidates:
+        scores[path] = sum(
+            (1 + math.log(len(match[path]))) * math.log(1 + total / len(match))
+            for match in matches
+        )
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(path, score, snippet(path, min(match[path][0] for match in matches))) for path, score in ranked]
+
+def snippet(path, offset):
+    """Text surrounding offset in the note at path, on a single line."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except OSError:
+        return ""
+    start = max(0, offset - SNIPPET_RADIUS)
+    end = min(len(text), offset + SNIPPET_RADIUS)
+    excerpt = " ".join(text[start:end].split())
+    return ("..." if start else "") + excerpt + ("..." if end < len(text) else "")
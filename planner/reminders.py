@@ -0,0 +1,95 @@
+import heapq
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from storage import store
+from my_calendar.my_calendar import load_event_index
+from deadlines.deadlines import load_deadlines, due_within
+
+EVENT_LEAD = timedelta(minutes=10)  # How long before an event starts to remind
+DEADLINE_REMINDER_HOUR = 9  # Deadlines are announced at this hour the day before they are due
+HORIZON = timedelta(days=1)  # How far ahead events are queued
+
+class ReminderEngine:
+    """Queue of upcoming deadline and event reminders.
+
+    Pending reminders sit in a min-heap ordered by the time they are due, and
+    a single threading.Timer is armed for the earliest one. When it fires,
+    every reminder that is due moves to the alerts queue and the timer is
+    re-armed for the next. The heap is rebuilt only when the calendar or
+    deadlines change in the store, or when the event horizon runs out.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._alerts = deque()
+        self._fired = set()  # Reminders already delivered, so a rebuild does not repeat them
+        self._timer = None
+        self._versions = None
+        self._valid_until = None
+        self._lock = threading.Lock()
+
+    def refresh(self, now=None):
+        """Rebuild the heap if the calendar or deadlines changed since the last build."""
+        now = now or datetime.now()
+        deadlines = load_deadlines()
+        index = load_event_index()
+        # Read after loading, which bumps the versions if the files changed on disk
+        versions = (store.version("calendar"), store.version("deadlines"))
+        if versions == self._versions and now < self._valid_until:
+            return
+        heap = []
+        for deadline in due_within(deadlines, 1, now.date()):
+            due = datetime.combine(deadline.due_date, datetime.min.time())
+            when = max(due - timedelta(days=1) + timedelta(hours=DEADLINE_REMINDER_HOUR), now)
+            day = "today" if deadline.due_date == now.date() else "tomorrow"
+            heap.append((when, ("deadline", deadline.name, due), f"'{deadline.name}' is due {day}"))
+        for event in index.overlapping(now, now + HORIZON):
+            if event.start_time < now or event.completed:
+                continue
+            when = max(event.start_time - EVENT_LEAD, now)
+            heap.append((when, ("event", event.title, event.start_time), f"'{event.title}' starts at {event.start_time.strftime('%I:%M %p')}"))
+
+        with self._lock:
+            keys = {key for _, key, _ in heap}
+            self._fired &= keys
+            self._heap = [item for item in heap if item[1] not in self._fired]
+            heapq.heapify(self._heap)
+            self._versions = versions
+            self._valid_until = now + HORIZON / 2
+            self._arm()
+
+    def _arm(self):
+        """Point the timer at the earliest pending reminder. Called with the lock held."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._heap:
+            delay = max(0.0, (self._heap[0][0] - datetime.now()).total_seconds())
+            self._timer = threading.Timer(delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            now = datetime.now()
+            while self._heap and self._heap[0][0] <= now:
+                _, key, message = heapq.heappop(self._heap)
+                self._fired.add(key)
+                self._alerts.append(message)
+            self._arm()
+
+    def drain(self):
+        """Return and clear the alerts that have come due."""
+        with self._lock:
+            alerts = list(self._alerts)
+            self._alerts.clear()
+        return alerts
+
+    def stop(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+reminders = ReminderEngine()
@@ -0,0 +1,6 @@
+from .store import DataStore, store, backend_from_env
+from .json_backend import JsonBackend
+from .sqlite_backend import SQLiteBackend
+from .records import Record, new_id, decode_valid
+
+__all__ = ['DataStore', 'store', 'backend_from_env', 'JsonBackend', 'SQLiteBackend', 'Record', 'new_id', 'decode_valid']
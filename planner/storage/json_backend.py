@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+from .records import record_rows, diff_rows
+
+# Number of journal entries after which the journal is folded into the snapshot
+COMPACT_THRESHOLD = 100
+
+class JsonBackend:
+    """Stores each dataset as a JSON snapshot plus an append-only journal.
+
+    A save appends one add/modify/remove entry per changed record to
+    "<path>.journal" instead of rewriting the whole file, and loading replays
+    the journal over the snapshot. Once the journal passes COMPACT_THRESHOLD
+    entries it is folded back into the snapshot on a background thread.
+    Snapshots are written to a temporary file and renamed into place, so an
+    interrupted save never leaves a truncated file behind.
+    """
+
+    errors = (IOError,)
+
+    def __init__(self, journal=True, compact_threshold=COMPACT_THRESHOLD):
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self._rows = {}  # Rows as of the last read or write, per dataset
+        self._kinds = {}  # list or dict, per dataset
+        self._entries = {}  # Journal entries written since the last snapshot
+        self._snapshots = {}  # Snapshot file stat the rows are based on
+        self._compacted = {}  # Stamp after our own compaction -> the stamp it replaced
+        self._lock = threading.Lock()
+
+    def stamp(self, name, path):
+        """Cheap change marker for a dataset, or None if it has never been saved.
+
+        Compacting rewrites both files without changing the data, so the
+        files as compaction left them report the stamp from before it.
+        """
+        stamp = _file_stamp(path)
+        compacted = self._compacted.get(name)
+        if compacted and compacted[0] == stamp:
+            return compacted[1]
+        return stamp
+
+    def read(self, name, path):
+        with self._lock:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, (list, dict)):
+                return data
+            entries, clean = _replay(data, path) if self.journal else (0, True)
+            if not clean:
+                # Fold what could be replayed into a new snapshot so later
+                # entries are not appended after a damaged or stale journal
+                rows = record_rows(data)
+                if entries:
+                    _write_atomic(path, json.dumps(data, default=str))
+                self._reset(name, path, rows, type(data))
+                return data
+            self._rows[name] = record_rows(data)
+            self._kinds[name] = type(data)
+            self._entries[name] = entries
+            self._snapshots[name] = _stat(path)
+            return data
+
+    def write(self, name, path, data):
+        with self._lock:
+            rows = record_rows(data) if isinstance(data, (list, dict)) else None
+            previous = self._rows.get(name)
+            if (not self.journal or rows is None or previous is None or self._kinds.get(name) is not type(data)
+                    or _stat(path) != self._snapshots.get(name)):
+                _write_atomic(path, json.dumps(data, default=str))
+                self._reset(name, path, rows, type(data))
+                return
+
+            changed, removed = diff_rows(previous, rows)
+            lines = []
+            for key in changed:
+                op = "modify" if key in previous else "add"
+                lines.append(f'{{"op": "{op}", "key": {json.dumps(key)}, "record": {rows[key]}}}\n')
+            # Positional keys are removed from the end so earlier positions stay valid
+            for key in sorted(removed, reverse=True, key=str if isinstance(data, dict) else None):
+                lines.append(json.dumps({"op": "remove", "key": key}) + "\n")
+            if lines:
+                journal_path = path + ".journal"
+                if not os.path.exists(journal_path):
+                    _write_atomic(journal_path, _journal_header(path))
+                with open(journal_path, 'a') as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._rows[name] = rows
+            self._entries[name] = self._entries.get(name, 0) + len(lines)
+            self._compacted.pop(name, None)
+
+            if self._entries[name] >= self.compact_threshold:
+                self._entries[name] = 0
+                threading.Thread(target=self.compact, args=(name, path), name=f"compact-{name}").start()
+
+    def compact(self, name, path):
+        """Fold the journal into a fresh snapshot and start a new, empty journal."""
+        with self._lock:
+            rows = self._rows.get(name)
+            if rows is None:
+                return
+            before = self.stamp(name, path)
+            if self._kinds[name] is list:
+                text = "[" + ", ".join(rows[key] for key in range(len(rows))) + "]"
+            else:
+                text = "{" + ", ".join(f"{json.dumps(key)}: {body}" for key, body in rows.items()) + "}"
+            _write_atomic(path, text)
+            self._reset(name, path, rows, self._kinds[name])
+            self._compacted[name] = (_file_stamp(path), before)
+
+    def _reset(self, name, path, rows, kind):
+        """Start a new journal on top of the snapshot just written."""
+        journal_path = path + ".journal"
+        if self.journal and rows is not None:
+            _write_atomic(journal_path, _journal_header(path))
+        elif os.path.exists(journal_path):
+            os.remove(journal_path)
+        if rows is not None:
+            self._rows[name] = rows
+            self._kinds[name] = kind
+        self._entries[name] = 0
+        self._snapshots[name] = _stat(path)
+        self._compacted.pop(name, None)
+
+def _file_stamp(path):
+    snapshot = _stat(path)
+    if snapshot is None:
+        return None
+    return (snapshot, _stat(path + ".journal"))
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _journal_header(path):
+    # Ties the journal to one snapshot; a journal left over from before the
+    # snapshot was replaced (or edited by hand) is ignored on load
+    return json.dumps({"snapshot": _stat(path)}) + "\n"
+
+def _write_atomic(path, text):
+    """Write text to path via a temporary file and rename."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _replay(data, path):
+    """Apply the journal for path to data in place.
+
+    Returns the number of entries applied and whether the journal was intact
+    and belongs to the current snapshot.
+    """
+    try:
+        with open(path + ".journal", 'r') as f:
+            lines = f.readlines()
+    except OSError:
+        return 0, True
+    try:
+        header = json.loads(lines[0])
+    except (IndexError, ValueError):
+        return 0, False
+    if header.get("snapshot") != list(_stat(path)):
+        return 0, False
+
+    applied = 0
+    for line in lines[1:]:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return applied, False  # A save interrupted mid-append; everything before it is intact
+        key = entry["key"]
+        if entry["op"] == "remove":
+            if isinstance(data, list):
+                if key < len(data):
+                    del data[key]
+            else:
+                data.pop(key, None)
+        elif isinstance(data, list) and key >= len(data):
+            data.append(entry["record"])
+        else:
+            data[key] = entry["record"]
+        applied += 1
+    return applied, True
@@ -0,0 +1,33 @@
+import os
+import sys
+from ui import console
+from .json_backend import JsonBackend
+from .sqlite_backend import SQLiteBackend
+from .store import DEFAULT_DATABASE, store
+
+def register_all_datasets():
+    """Import every planner module so its dataset is registered with the store."""
+    import my_calendar.my_calendar  # noqa: F401
+    import tasks.tasks  # noqa: F401
+    import habits.habits  # noqa: F401
+    import students.students  # noqa: F401
+    import deadlines.deadlines  # noqa: F401
+
+def migrate_json_to_sqlite(db_path=DEFAULT_DATABASE):
+    """Copy every existing *_data.json dataset into the SQLite database at db_path."""
+    register_all_datasets()
+    source = JsonBackend()
+    target = SQLiteBackend(db_path)
+    migrated = []
+    for name, path in store.datasets().items():
+        if not os.path.exists(path):
+            continue
+        target.write(name, path, source.read(name, path))
+        migrated.append(name)
+    return migrated
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATABASE
+    for name in migrate_json_to_sqlite(db_path):
+        console.print(f"[bold #FC6C85]Migrated {name} into {db_path}[/bold #FC6C85]")
+    console.print(f"[bold #FC6C85]Set PLANNER_STORAGE=sqlite to use it.[/bold #FC6C85]")
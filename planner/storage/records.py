@@ -0,0 +1,85 @@
+import json
+import uuid
+from ui import console
+
+def new_id():
+    """Return a new stable identifier for a record."""
+    return uuid.uuid4().hex
+
+class Record:
+    """Base for the __slots__ record classes, with the dict-style access older code uses.
+
+    A field set to None counts as missing, so `"count" in event`, event.get()
+    and event.pop() behave as they did when records were plain dicts. Each
+    lookup goes through __slots__, so code on hot paths reads attributes.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = getattr(self, key) if key in self.__slots__ else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def pop(self, key, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = getattr(self, key)
+        setattr(self, key, None)
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def keys(self):
+        return [key for key in self.__slots__ if getattr(self, key) is not None]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+def decode_valid(data, decode, kind):
+    """Decode each stored record of a list or dict dataset, leaving out the malformed ones.
+
+    A bad record is reported and skipped rather than failing the whole
+    dataset, so the next save does not overwrite the good records with an
+    empty list.
+    """
+    items = enumerate(data) if isinstance(data, list) else data.items()
+    decoded = {}
+    for key, record in items:
+        try:
+            decoded[key] = decode(record)
+        except ValueError as e:
+            console.print(f"[bold red]Skipping invalid {kind} {key}: {e}[/bold red]")
+    return list(decoded.values()) if isinstance(data, list) else decoded
+
+def record_rows(data):
+    """Split a list or dict dataset into {key: serialised record} rows.
+
+    Lists are keyed by position and dicts by their own keys, so two versions
+    of a dataset can be compared row by row.
+    """
+    items = enumerate(data) if isinstance(data, list) else data.items()
+    return {key: json.dumps(record, default=str) for key, record in items}
+
+def diff_rows(previous, rows):
+    """Return the keys added or changed and the keys removed between two row maps."""
+    changed = [key for key, body in rows.items() if previous.get(key) != body]
+    removed = [key for key in previous if key not in rows]
+    return changed, removed
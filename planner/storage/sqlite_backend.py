@@ -0,0 +1,133 @@
+import json
+import sqlite3
+from .records import diff_rows
+
+# Columns pulled out of each record so they can be indexed; the full record
+# is kept as JSON in the body column.
+LIST_TABLES = {
+    "calendar": ("start_time", "end_time"),
+    "tasks": ("day",),
+    "habits": (),
+    "deadlines": ("due_date",),
+}
+DICT_TABLES = {
+    "students": (),
+}
+INDEXES = {
+    "calendar": [("start_time", "end_time")],
+    "tasks": [("day",)],
+    "deadlines": [("due_date",)],
+    "attendance": [("student_id", "date")],
+}
+
+class SQLiteBackend:
+    """Stores every dataset in one SQLite database.
+
+    Saves run in a single transaction and only touch the rows that differ from
+    what was last read or written, so a one-record change writes one row and
+    an interrupted save leaves the previous state intact.
+    """
+
+    errors = (IOError, sqlite3.Error)
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._rows = {}  # Last known rows per dataset, used to diff saves
+        self._versions = {}  # Dataset version those rows correspond to
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._create_schema()
+        return self._conn
+
+    def _create_schema(self):
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (dataset TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS blobs (dataset TEXT PRIMARY KEY, body TEXT NOT NULL)")
+            for name, columns in LIST_TABLES.items():
+                extra = "".join(f", {column} TEXT" for column in columns)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (key INTEGER PRIMARY KEY{extra}, body TEXT NOT NULL)")
+            for name, columns in DICT_TABLES.items():
+                extra = "".join(f", {column} TEXT" for column in columns)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (key TEXT PRIMARY KEY{extra}, body TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS attendance (student_id TEXT NOT NULL, seq INTEGER NOT NULL, date TEXT NOT NULL, "
+                "PRIMARY KEY (student_id, seq))"
+            )
+            for name, indexes in INDEXES.items():
+                for columns in indexes:
+                    self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{'_'.join(columns)} ON {name} ({', '.join(columns)})")
+
+    def stamp(self, name, path):
+        row = self.conn.execute("SELECT version FROM meta WHERE dataset = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def read(self, name, path):
+        if name in LIST_TABLES or name in DICT_TABLES:
+            rows = self.conn.execute(f"SELECT key, body FROM {name} ORDER BY key").fetchall()
+            data = [json.loads(body) for _, body in rows] if name in LIST_TABLES else {key: json.loads(body) for key, body in rows}
+            self._remember(name, dict(rows))
+            return data
+        if name == "attendance":
+            rows = self.conn.execute("SELECT student_id, seq, date FROM attendance ORDER BY student_id, seq").fetchall()
+            attendance = {}
+            for student_id, _, date in rows:
+                attendance.setdefault(student_id, []).append(date)
+            self._remember(name, {(student_id, seq): date for student_id, seq, date in rows})
+            return attendance
+        row = self.conn.execute("SELECT body FROM blobs WHERE dataset = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def write(self, name, path, data):
+        with self.conn:
+            if name in LIST_TABLES or name in DICT_TABLES:
+                columns = LIST_TABLES.get(name, DICT_TABLES.get(name))
+                items = enumerate(data) if name in LIST_TABLES else data.items()
+                rows, params = {}, {}
+                for key, record in items:
+                    rows[key] = json.dumps(record, default=str)
+                    params[key] = (key, *(record.get(column) for column in columns), rows[key])
+                placeholders = ", ?" * len(columns)
+                self._apply(name, rows, params,
+                            f"INSERT OR REPLACE INTO {name} (key{''.join(', ' + c for c in columns)}, body) VALUES (?{placeholders}, ?)",
+                            f"DELETE FROM {name} WHERE key = ?")
+            elif name == "attendance":
+                rows = {(str(student_id), seq): date for student_id, dates in data.items() for seq, date in enumerate(dates)}
+                params = {key: (key[0], key[1], date) for key, date in rows.items()}
+                self._apply(name, rows, params,
+                            "INSERT OR REPLACE INTO attendance (student_id, seq, date) VALUES (?, ?, ?)",
+                            "DELETE FROM attendance WHERE student_id = ? AND seq = ?")
+            else:
+                self.conn.execute("INSERT OR REPLACE INTO blobs (dataset, body) VALUES (?, ?)", (name, json.dumps(data, default=str)))
+            self.conn.execute(
+                "INSERT INTO meta (dataset, version) VALUES (?, 1) ON CONFLICT(dataset) DO UPDATE SET version = version + 1",
+                (name,),
+            )
+        if name in self._rows:
+            self._versions[name] = self.stamp(name, path)
+
+    def _remember(self, name, rows):
+        self._rows[name] = rows
+        self._versions[name] = self.stamp(name, None)
+
+    def _apply(self, name, rows, params, upsert, delete):
+        """Write only the rows that changed since the dataset was last read or written."""
+        previous = self._rows.get(name)
+        if previous is None or self._versions.get(name) != self.stamp(name, None):
+            # Someone else wrote the dataset since we last saw it; diff against the database
+            previous = dict(self._current_rows(name))
+        changed, removed = diff_rows(previous, rows)
+        if changed:
+            self.conn.executemany(upsert, [params[key] for key in changed])
+        if removed:
+            self.conn.executemany(delete, [key if isinstance(key, tuple) else (key,) for key in removed])
+        self._rows[name] = rows
+
+    def _current_rows(self, name):
+        if name == "attendance":
+            return (((student_id, seq), date) for student_id, seq, date in
+                    self.conn.execute("SELECT student_id, seq, date FROM attendance"))
+        return self.conn.execute(f"SELECT key, body FROM {name}")
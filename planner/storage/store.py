@@ -0,0 +1,107 @@
+import os
+from ui import console
+from .json_backend import JsonBackend
+from .sqlite_backend import SQLiteBackend
+
+# Selects where datasets live: "json" (one file per dataset) or "sqlite"
+STORAGE_ENV = "PLANNER_STORAGE"
+DATABASE_ENV = "PLANNER_DB"
+DEFAULT_DATABASE = "planner.db"
+
+class DataStore:
+    """In-process cache for the planner's datasets.
+
+    Each dataset is read from its backend once and handed out from memory
+    after that. A dataset is reloaded only when it changes underneath us, and
+    saves just mark it dirty so that several saves during one menu action are
+    written out together by flush().
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or JsonBackend()
+        self._datasets = {}
+
+    def register(self, name, path, default=list, decode=None, encode=None):
+        """Register a dataset stored at path.
+
+        decode turns the parsed JSON into the in-memory form and encode turns it
+        back; default builds the value used when the file does not exist yet.
+        """
+        if name not in self._datasets:
+            self._datasets[name] = {
+                "path": path,
+                "default": default,
+                "decode": decode,
+                "encode": encode,
+                "data": None,
+                "loaded": False,
+                "dirty": False,
+                "stamp": None,
+                "version": 0,
+            }
+
+    def get(self, name):
+        """Return the cached data for a dataset, loading it if needed."""
+        dataset = self._datasets[name]
+        if not dataset["loaded"] or (not dataset["dirty"] and self._stamp(name) != dataset["stamp"]):
+            self._load(name, dataset)
+        return dataset["data"]
+
+    def set(self, name, data):
+        """Replace a dataset in memory and mark it for writing on the next flush."""
+        dataset = self._datasets[name]
+        dataset["data"] = data
+        dataset["loaded"] = True
+        dataset["dirty"] = True
+        dataset["version"] += 1
+
+    def version(self, name):
+        """Counter bumped whenever a dataset is changed or reloaded."""
+        return self._datasets[name]["version"]
+
+    def is_dirty(self, name):
+        return self._datasets[name]["dirty"]
+
+    def datasets(self):
+        """Names and paths of every registered dataset."""
+        return {name: dataset["path"] for name, dataset in self._datasets.items()}
+
+    def flush(self):
+        """Write every dirty dataset back to its backend."""
+        for name, dataset in self._datasets.items():
+            if not dataset["dirty"]:
+                continue
+            data = dataset["data"]
+            if dataset["encode"]:
+                data = dataset["encode"](data)
+            try:
+                self.backend.write(name, dataset["path"], data)
+                dataset["dirty"] = False
+                dataset["stamp"] = self._stamp(name)
+            except self.backend.errors as e:
+                console.print(f"[bold red]Error saving {name} data: {e}[/bold red]")
+
+    def _load(self, name, dataset):
+        stamp = self._stamp(name)
+        data = None if stamp is None else self.backend.read(name, dataset["path"])
+        if data is None:
+            data = dataset["default"]()
+        elif dataset["decode"]:
+            data = dataset["decode"](data)
+        dataset["data"] = data
+        dataset["loaded"] = True
+        dataset["dirty"] = False
+        dataset["stamp"] = stamp
+        dataset["version"] += 1
+
+    def _stamp(self, name):
+        return self.backend.stamp(name, self._datasets[name]["path"])
+
+def backend_from_env():
+    """Build the storage backend chosen by the PLANNER_STORAGE environment variable."""
+    if os.environ.get(STORAGE_ENV, "json").lower() == "sqlite":
+        return SQLiteBackend(os.environ.get(DATABASE_ENV, DEFAULT_DATABASE))
+    return JsonBackend()
+
+# Shared by every planner module
+store = DataStore(backend_from_env())
@@ -0,0 +1,64 @@
+from bisect import bisect_left, insort
+
+def month_key(day):
+    """"YYYY-MM" for an ISO date string."""
+    return day[:7]
+
+def next_month_key(year, month):
+    return f"{year + month // 12}-{month % 12 + 1:02d}"
+
+class AttendanceLedger:
+    """Attendance dates per student, indexed by (student, year-month).
+
+    Each student's dates are kept sorted, so a month's sessions are a range
+    lookup with bisect, and a running count per (student, month) is updated
+    as sessions are recorded instead of being recounted from the history.
+    The ledger works on the attendance dict itself, so recording through it
+    also updates the data that gets saved.
+    """
+
+    def __init__(self, attendance_data, version=None):
+        self.attendance_data = attendance_data
+        self.version = version
+        self._totals = {}
+        for student_id, dates in attendance_data.items():
+            dates.sort()
+            for day in dates:
+                key = (student_id, month_key(day))
+                self._totals[key] = self._totals.get(key, 0) + 1
+
+    def record(self, student_id, day):
+        """Add a session on day (an ISO date string) for a student."""
+        insort(self.attendance_data.setdefault(student_id, []), day)
+        key = (student_id, month_key(day))
+        self._totals[key] = self._totals.get(key, 0) + 1
+
+    def remove_student(self, student_id):
+        """Drop a student's whole history."""
+        self.attendance_data.pop(student_id, None)
+        for key in [key for key in self._totals if key[0] == student_id]:
+            del self._totals[key]
+
+    def sessions(self, student_id, year, month):
+        """Dates a student attended in the given month, in order."""
+        dates = self.attendance_data.get(student_id, [])
+        first = bisect_left(dates, f"{year}-{month:02d}")
+        last = bisect_left(dates, next_month_key(year, month), lo=first)
+        return dates[first:last]
+
+    def month_total(self, student_id, year, month):
+        """Number of sessions a student attended in the given month."""
+        return self._totals.get((student_id, f"{year}-{month:02d}"), 0)
+
+    def months(self, student_id):
+        """Every "YYYY-MM" the student has sessions in, oldest first."""
+        return sorted(key[1] for key in self._totals if key[0] == student_id)
+
+_cached_ledger = None
+
+def get_ledger(attendance_data, version):
+    """Return the ledger for attendance_data, rebuilding it only when the data changed elsewhere."""
+    global _cached_ledger
+    if _cached_ledger is None or _cached_ledger.version != version or _cached_ledger.attendance_data is not attendance_data:
+        _cached_ledger = AttendanceLedger(attendance_data, version)
+    return _cached_ledger
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from storage import Record
+
+@dataclass(slots=True)
+class Student(Record):
+    """A tutoring student; receipt_format is None for the default format."""
+    name: str
+    cost_per_class: float = 0.0
+    sessions: int = 0
+    receipt_format: str | None = None
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build a student from its stored form, raising ValueError if a field is missing or malformed."""
+        try:
+            return cls(
+                name=str(record["name"]),
+                cost_per_class=float(record.get("cost_per_class", 0.0)),  # Older records have no rate
+                sessions=int(record.get("sessions", 0)),
+                receipt_format=record.get("receipt_format") or None,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"invalid student {record!r}: {e!r}")
+
+    def to_dict(self):
+        """Stored form of the student."""
+        record = {"name": self.name, "cost_per_class": self.cost_per_class, "sessions": self.sessions}
+        if self.receipt_format:
+            record["receipt_format"] = self.receipt_format
+        return record
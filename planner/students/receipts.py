@@ -0,0 +1,82 @@
+import html
+import string
+from datetime import datetime
+from functools import lru_cache
+
+DEFAULT_FORMAT = "text"
+
+def escape_csv(value):
+    """Quote a CSV field if it contains a separator, quote or newline."""
+    if any(char in value for char in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def escape_markdown(value):
+    return value.replace("|", "\\|")
+
+# Each format is rendered as a header, one row per class attended, and a footer
+TEMPLATES = {
+    "text": {
+        "extension": "txt",
+        "escape": str,
+        "header": "{name} {month_name} {year}\n------------------------------------------\nClasses Attended:\n",
+        "row": "- {date}\n",
+        "footer": "\nNumber of Classes: {classes}\nCost per Class: ${cost_per_class}\nTotal Due: ${total_due}\n",
+    },
+    "markdown": {
+        "extension": "md",
+        "escape": escape_markdown,
+        "header": "# {name} - {month_name} {year}\n\n## Classes Attended\n\n",
+        "row": "- {date}\n",
+        "footer": "\n| Number of Classes | Cost per Class | Total Due |\n| --- | --- | --- |\n| {classes} | ${cost_per_class} | ${total_due} |\n",
+    },
+    "csv": {
+        "extension": "csv",
+        "escape": escape_csv,
+        "header": "student,month,date,cost\n",
+        "row": "{name},{month_name} {year},{date},{cost_per_class}\n",
+        "footer": "{name},{month_name} {year},total,{total_due}\n",
+    },
+    "html": {
+        "extension": "html",
+        "escape": html.escape,
+        "header": "<!DOCTYPE html>\n<html>\n<head><title>{name} {month_name} {year}</title></head>\n<body>\n"
+                  "<h1>{name} {month_name} {year}</h1>\n<h2>Classes Attended</h2>\n<ul>\n",
+        "row": "<li>{date}</li>\n",
+        "footer": "</ul>\n<p>Number of Classes: {classes}<br>\nCost per Class: ${cost_per_class}<br>\nTotal Due: ${total_due}</p>\n</body>\n</html>\n",
+    },
+}
+FORMATS = tuple(TEMPLATES)
+
+_formatter = string.Formatter()
+
+@lru_cache(maxsize=None)
+def compile_template(source):
+    """Split a template into (literal, field, format spec) parts once, so rendering is a single join."""
+    return tuple((literal, field, spec) for literal, field, spec, _ in _formatter.parse(source))
+
+def render(parts, values, escape):
+    return "".join(
+        literal if field is None else literal + escape(format(values[field], spec))
+        for literal, field, spec in parts
+    )
+
+def render_receipt(student, attendance_dates, year, month):
+    """Render a month's receipt in the student's "receipt_format"; returns (content, file extension)."""
+    template = TEMPLATES.get(student.receipt_format or DEFAULT_FORMAT, TEMPLATES[DEFAULT_FORMAT])
+    escape = template["escape"]
+    values = {
+        "name": student.name,
+        "month_name": datetime(year, month, 1).strftime("%B"),
+        "year": year,
+        "classes": len(attendance_dates),
+        "cost_per_class": student.cost_per_class,
+        "total_due": len(attendance_dates) * student.cost_per_class,
+    }
+    row = compile_template(template["row"])
+    buffer = [render(compile_template(template["header"]), values, escape)]
+    for date in attendance_dates:
+        values["date"] = date
+        buffer.append(render(row, values, escape))
+    buffer.append(render(compile_template(template["footer"]), values, escape))
+    return "".join(buffer), template["extension"]
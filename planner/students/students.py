@@ -1,45 +1,58 @@
+import csv
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from rich.console import Console
+from ui import console
 from rich.table import Table
 import subprocess
-
-console = Console()
+from storage import store, decode_valid
+from students.models import Student
+from students.ledger import get_ledger
+from students.receipts import render_receipt, FORMATS, DEFAULT_FORMAT
 
 students_file = "students_data.json"  # File to store student data
 attendance_file = "attendance_data.json"  # File to store attendance data
+receipts_directory = "receipts"  # Directory for batch receipts, one folder per month
+RECEIPT_WORKERS = 8
 
 students_data = {}  # Dictionary to hold student information
 attendance_data = {}  # Dictionary to hold attendance information
 
+def decode_students(students_data):
+    return decode_valid(students_data, Student.from_dict, "student")
+
+def encode_students(students_data):
+    return {student_id: student.to_dict() for student_id, student in students_data.items()}
+
+store.register("students", students_file, default=dict, decode=decode_students, encode=encode_students)
+store.register("attendance", attendance_file, default=dict)
+
 def load_students():
     global students_data
-    if os.path.exists(students_file):
-        with open(students_file, 'r') as f:
-            students_data = json.load(f)
-        # Ensure all students have the cost_per_class key
-        for student in students_data.values():
-            if 'cost_per_class' not in student:
-                student['cost_per_class'] = 0.0
-    else:
+    try:
+        students_data = store.get("students")
+    except ValueError as e:
+        console.print(f"[bold red]Error loading students: {e}[/bold red]")
         students_data = {}
+    return students_data
 
 def save_students():
-    with open(students_file, 'w') as f:
-        json.dump(students_data, f, default=str)
+    store.set("students", students_data)
 
 def load_attendance():
     global attendance_data
-    if os.path.exists(attendance_file):
-        with open(attendance_file, 'r') as f:
-            attendance_data = json.load(f)
-    else:
-        attendance_data = {}
+    attendance_data = store.get("attendance")
 
 def save_attendance():
-    with open(attendance_file, 'w') as f:
-        json.dump(attendance_data, f, default=str)
+    store.set("attendance", attendance_data)
+
+def load_ledger():
+    load_attendance()
+    return get_ledger(attendance_data, store.version("attendance"))
+
+def save_ledger(ledger):
+    save_attendance()
+    ledger.version = store.version("attendance")
 
 def display_students():
     load_students()
@@ -53,7 +66,7 @@ def display_students():
     table.add_column("Cost per Class", style="bold #FC6C85")
 
     for student_id, student in students_data.items():
-        table.add_row(str(student_id), student["name"], f"${student['cost_per_class']}")
+        table.add_row(str(student_id), student.name, f"${student.cost_per_class}")
 
     console.print(table)
 
@@ -61,13 +74,18 @@ def add_student():
     load_students()
     name = console.input("[#FC6C85]Student name: [/#FC6C85]")
     cost_per_class = float(console.input("[#FC6C85]Cost per class: [/#FC6C85]"))
+    receipt_format = console.input(f"[#FC6C85]Receipt format ({', '.join(FORMATS)}, blank for {DEFAULT_FORMAT}): [/#FC6C85]").strip().lower() or DEFAULT_FORMAT
+    if receipt_format not in FORMATS:
+        console.print("[bold red]Unknown receipt format![/bold red]")
+        return
     student_id = max([int(k) for k in students_data.keys()], default=0) + 1  # Increment the highest ID
-    students_data[str(student_id)] = {"name": name, "cost_per_class": cost_per_class, "sessions": 0}
+    students_data[str(student_id)] = Student(name, cost_per_class, receipt_format=receipt_format)
     save_students()
     console.print("[bold #FC6C85]Student added successfully![/bold #FC6C85]")
 
 def delete_student():
     load_students()
+    ledger = load_ledger()
     if not students_data:
         console.print("[bold red]No students to delete![/bold red]")
         return
@@ -81,17 +99,16 @@ def delete_student():
 
     if str(student_id) in students_data:
         del students_data[str(student_id)]
-        if str(student_id) in attendance_data:
-            del attendance_data[str(student_id)]
+        ledger.remove_student(str(student_id))
         save_students()
-        save_attendance()
+        save_ledger(ledger)
         console.print("[bold #FC6C85]Student deleted successfully![/bold #FC6C85]")
     else:
         console.print("[bold red]Invalid student ID![/bold red]")
 
 def mark_attendance():
     load_students()
-    load_attendance()
+    ledger = load_ledger()
     if not students_data:
         console.print("[bold red]No students to mark attendance for![/bold red]")
         return
@@ -105,38 +122,24 @@ def mark_attendance():
 
     if str(student_id) in students_data:
         date = datetime.now().strftime("%Y-%m-%d")
-        if str(student_id) not in attendance_data:
-            attendance_data[str(student_id)] = []
-        attendance_data[str(student_id)].append(date)
-        students_data[str(student_id)]["sessions"] += 1
-        save_attendance()
+        ledger.record(str(student_id), date)
+        students_data[str(student_id)].sessions += 1
+        save_ledger(ledger)
         save_students()
         console.print("[bold #FC6C85]Attendance marked for today![/bold #FC6C85]")
     else:
         console.print("[bold red]Invalid student ID![/bold red]")
 
-def generate_receipt(student_id):
+def generate_receipt(student_id, year=None, month=None):
     load_students()
-    load_attendance()
-    if str(student_id) in students_data and str(student_id) in attendance_data:
+    ledger = load_ledger()
+    now = datetime.now()
+    year, month = year or now.year, month or now.month
+    if str(student_id) in students_data and ledger.month_total(str(student_id), year, month):
         student = students_data[str(student_id)]
-        attendance_dates = attendance_data[str(student_id)]
-        month = datetime.now().strftime("%B")
-        year = datetime.now().year
-        cost_per_class = student["cost_per_class"]
-        total_cost = student["sessions"] * cost_per_class
-
-        receipt_content = f"{student['name']} {month} {year}\n"
-        receipt_content += "------------------------------------------\n"
-        receipt_content += "Classes Attended:\n"
-        for date in attendance_dates:
-            receipt_content += f"- {date}\n"
-        receipt_content += "\n"
-        receipt_content += f"Number of Classes: {student['sessions']}\n"
-        receipt_content += f"Cost per Class: ${cost_per_class}\n"
-        receipt_content += f"Total Due: ${total_cost}\n"
-
-        receipt_file = f"receipt_{student_id}_{month}_{year}.txt"
+        receipt_content, extension = render_receipt(student, ledger.sessions(str(student_id), year, month), year, month)
+
+        receipt_file = f"receipt_{student_id}_{datetime(year, month, 1).strftime('%B')}_{year}.{extension}"
         with open(receipt_file, 'w') as f:
             f.write(receipt_content)
 
@@ -153,13 +156,79 @@ def generate_receipt(student_id):
         except Exception as e:
             console.print(f"[bold red]Failed to open the receipt file: {e}[/bold red]")
     else:
-        console.print("[bold red]Invalid student ID or no attendance records found![/bold red]")
+        console.print("[bold red]Invalid student ID or no attendance records found for that month![/bold red]")
+
+def generate_all_receipts(year=None, month=None, show=True):
+    # Every receipt comes from the data loaded once here; the files are
+    # written by a thread pool into receipts/YYYY-MM with a CSV summary.
+    # With show=False nothing is printed and the caller reports the result.
+    load_students()
+    ledger = load_ledger()
+    now = datetime.now()
+    year, month = year or now.year, month or now.month
+    jobs = [
+        (student_id, student, ledger.sessions(student_id, year, month))
+        for student_id, student in students_data.items()
+        if ledger.month_total(student_id, year, month)
+    ]
+    if not jobs:
+        if show:
+            console.print("[bold red]No attendance records found for that month![/bold red]")
+        return []
+
+    output_directory = os.path.join(receipts_directory, f"{year}-{month:02d}")
+    os.makedirs(output_directory, exist_ok=True)
+
+    def write_receipt(job):
+        student_id, student, attendance_dates = job
+        receipt_content, extension = render_receipt(student, attendance_dates, year, month)
+        receipt_file = os.path.join(output_directory, f"receipt_{student_id}.{extension}")
+        with open(receipt_file, 'w') as f:
+            f.write(receipt_content)
+        return receipt_file
+
+    with ThreadPoolExecutor(max_workers=min(RECEIPT_WORKERS, len(jobs))) as pool:
+        receipt_files = list(pool.map(write_receipt, jobs))
+
+    summary_file = os.path.join(output_directory, "summary.csv")
+    with open(summary_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "name", "classes", "cost_per_class", "total_due", "receipt"])
+        for (student_id, student, attendance_dates), receipt_file in zip(jobs, receipt_files):
+            writer.writerow([student_id, student.name, len(attendance_dates), student.cost_per_class,
+                             len(attendance_dates) * student.cost_per_class, os.path.basename(receipt_file)])
+
+    if not show:
+        return receipt_files
+    table = Table(title=f"Receipts {datetime(year, month, 1).strftime('%B %Y')}", show_header=True, header_style="bold magenta")
+    table.add_column("ID", style="bold #FC6C85")
+    table.add_column("Name", style="bold #FC6C85")
+    table.add_column("Classes", style="bold #FC6C85")
+    table.add_column("Total Due", style="bold #FC6C85")
+    for student_id, student, attendance_dates in jobs:
+        table.add_row(student_id, student.name, str(len(attendance_dates)), f"${len(attendance_dates) * student.cost_per_class}")
+    console.print(table)
+    console.print(f"[bold #FC6C85]{len(receipt_files)} receipts and a summary written to {output_directory}[/bold #FC6C85]")
+    return receipt_files
+
+def prompt_month():
+    month = console.input("[#FC6C85]Month (YYYY-MM, blank for this month): [/#FC6C85]").strip()
+    if not month:
+        return None, None
+    month = datetime.strptime(month, "%Y-%m")
+    return month.year, month.month
 
 def display_receipts():
     load_students()
     display_students()
     try:
         student_id = int(console.input("[#FC6C85]Enter student ID to generate receipt: [/#FC6C85]"))
-        generate_receipt(student_id)
+        generate_receipt(student_id, *prompt_month())
     except ValueError:
-        console.print("[bold red]Invalid input! Please enter a valid numeric student ID.[/bold red]")
+        console.print("[bold red]Invalid input! Please enter a numeric student ID and a month as YYYY-MM.[/bold red]")
+
+def display_all_receipts():
+    try:
+        generate_all_receipts(*prompt_month())
+    except ValueError:
+        console.print("[bold red]Invalid input! Please enter the month as YYYY-MM.[/bold red]")
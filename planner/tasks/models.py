@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from storage import Record, new_id
+
+DAYS_OF_WEEK = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+@dataclass(slots=True)
+class Task(Record):
+    """A to-do item; day is a lowercase weekday name or "" and time is in minutes."""
+    title: str
+    day: str
+    time: int
+    done: bool = False
+    scheduled: bool = False
+    recurrence: str = "none"
+    deadline: str | None = None
+    id: str = field(default_factory=new_id)
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build a task from its stored form, raising ValueError if a field is missing or malformed."""
+        try:
+            task = cls(
+                title=str(record["title"]),
+                day=(record.get("day") or "").lower(),
+                time=int(record["time"]),
+                done=bool(record.get("done", False)),
+                scheduled=bool(record.get("scheduled", False)),
+                recurrence=(record.get("recurrence") or "none").lower(),
+                deadline=record.get("deadline") or None,
+                id=record.get("id") or new_id(),  # Tasks saved before ids existed get one now
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"invalid task {record!r}: {e!r}")
+        if task.day and task.day not in DAYS_OF_WEEK:
+            raise ValueError(f"task '{task.title}' has an invalid day '{task.day}'")
+        return task
+
+    def to_dict(self):
+        """Stored form of the task."""
+        record = {
+            "id": self.id,
+            "title": self.title,
+            "day": self.day,
+            "time": self.time,
+            "done": self.done,
+            "scheduled": self.scheduled,
+            "recurrence": self.recurrence,
+        }
+        if self.deadline:
+            record["deadline"] = self.deadline
+        return record
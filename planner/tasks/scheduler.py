@@ -0,0 +1,75 @@
+import heapq
+from datetime import datetime, timedelta
+from my_calendar.event_index import EventIndex
+from my_calendar.models import Event
+from my_calendar.availability import Availability, DAY_START_HOUR, DEFAULT_HORIZON_DAYS
+
+from tasks.models import DAYS_OF_WEEK
+
+def earliest_start(task, now):
+    """Earliest time a task may be auto-scheduled: 8 AM on its next day, but never in the past.
+
+    Tasks linked to a deadline without a day of their own may start right away.
+    """
+    day = task.day
+    offset = (DAYS_OF_WEEK.index(day) - now.weekday()) % 7 if day in DAYS_OF_WEEK else 0
+    start_time = datetime.combine(now.date() + timedelta(days=offset), datetime.min.time()).replace(hour=DAY_START_HOUR)
+    if task.deadline and day not in DAYS_OF_WEEK:
+        start_time = now
+    return max(start_time, now + timedelta(minutes=1))
+
+def deadline_dates(deadlines):
+    """Map deadline names to the datetime work has to be finished by (the start of the due day)."""
+    return {
+        deadline.name: datetime.combine(deadline.due_date, datetime.min.time())
+        for deadline in deadlines
+    }
+
+def schedule_all_tasks(tasks_data, calendar_data, deadlines=(), now=None, horizon_days=DEFAULT_HORIZON_DAYS):
+    """Pack every unscheduled task into the calendar's free time in one pass.
+
+    Tasks come off an earliest-deadline-first priority queue; tasks without a
+    deadline follow in order of their day and, within a day, longest first.
+    A task linked to a deadline may be placed on any day before it is due and
+    is split over several free stretches if no single gap is long enough;
+    other tasks go into the first gap within horizon_days that fits them.
+    calendar_data and the tasks are updated in place.
+    Returns (placed, unfit) where placed is a list of (task, [(start, end), ...]).
+    """
+    now = now or datetime.now()
+    due_dates = deadline_dates(deadlines)
+    availability = Availability(EventIndex(calendar_data))
+
+    queue = []
+    for i, task in enumerate(tasks_data):
+        if task.scheduled or task.done:
+            continue
+        due = due_dates.get(task.deadline, datetime.max)
+        heapq.heappush(queue, (due, earliest_start(task, now), -task.time, i, task))
+
+    placed, unfit = [], []
+    while queue:
+        due, earliest, _, _, task = heapq.heappop(queue)
+        duration = timedelta(minutes=task.time)
+        if due == datetime.max:
+            start_time = availability.find_slot(earliest, duration, horizon_days)
+            chunks = [(start_time, start_time + duration)] if start_time else None
+        elif earliest >= due:
+            chunks = None
+        else:
+            days_left = (due.date() - earliest.date()).days + 1
+            start_time = availability.find_slot(earliest, duration, days_left, latest=due)
+            if start_time:
+                chunks = [(start_time, start_time + duration)]
+            else:
+                chunks = availability.find_chunks(earliest, duration, due)
+
+        if not chunks:
+            unfit.append(task)
+            continue
+        for start_time, end_time in chunks:
+            calendar_data.append(Event(task.title, start_time, end_time, task.recurrence, task_id=task.id))
+            availability.reserve(start_time, end_time)
+        task.scheduled = True
+        placed.append((task, chunks))
+    return placed, unfit
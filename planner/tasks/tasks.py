@@ -1,35 +1,61 @@
 import json
-import os
 from datetime import datetime, timedelta
-from rich.console import Console
+from ui import console
 from rich.table import Table
+from storage import store, decode_valid
+from tasks.models import Task, DAYS_OF_WEEK
 
-console = Console()
 tasks_file = "tasks_data.json"  # Path to your tasks data file
 
 tasks_data = []  # Global variable to store tasks
+unlinked_ids = False  # Set when tasks saved before ids existed were given ids, until their events are linked
+
+def decode_tasks(tasks_data):
+    """Convert stored tasks to Task records, checking each one."""
+    global unlinked_ids
+    unlinked_ids = unlinked_ids or any(not record.get("id") for record in tasks_data)
+    return decode_valid(tasks_data, Task.from_dict, "task")
+
+def encode_tasks(tasks_data):
+    return [task.to_dict() for task in tasks_data]
+
+store.register("tasks", tasks_file, decode=decode_tasks, encode=encode_tasks)
 
 def load_tasks():
-    """Load tasks from the JSON file."""
+    """Load tasks from the shared store."""
     global tasks_data
-    if os.path.exists(tasks_file):
-        try:
-            with open(tasks_file, 'r') as f:
-                tasks_data = json.load(f)
-        except json.JSONDecodeError as e:
-            console.print(f"[bold red]Error loading tasks: {e}[/bold red]")
-            tasks_data = []
-    else:
+    try:
+        tasks_data = store.get("tasks")
+    except (json.JSONDecodeError, ValueError) as e:
+        console.print(f"[bold red]Error loading tasks: {e}[/bold red]")
         tasks_data = []
+    if unlinked_ids:
+        link_legacy_events(tasks_data)
     return tasks_data
 
+def link_legacy_events(tasks_data):
+    """Link events scheduled before ids existed to the one scheduled task with their title, and keep the new ids."""
+    from my_calendar.my_calendar import load_event_ids, save_calendar  # Local import to avoid circular dependency
+    global unlinked_ids
+    unlinked_ids = False
+    by_title = {}
+    for task in tasks_data:
+        if task.scheduled:
+            by_title.setdefault(task.title, []).append(task)
+    event_ids = load_event_ids()
+    linked = 0
+    for event in list(event_ids.calendar_data):
+        matches = by_title.get(event.title, ()) if not event.task_id else ()
+        if len(matches) == 1:  # Titles shared by several tasks are left alone rather than guessed
+            event_ids.link(event, matches[0].id)
+            linked += 1
+    if linked:
+        save_calendar(event_ids.calendar_data, event_ids)
+    save_tasks(tasks_data)
+
 def save_tasks(tasks_data):
-    """Save tasks to the JSON file."""
-    try:
-        with open(tasks_file, 'w') as f:
-            json.dump(tasks_data, f)
-    except IOError as e:
-        console.print(f"[bold red]Error saving tasks: {e}[/bold red]")
+    """Save tasks; they are written to disk on the next store flush."""
+    store.set("tasks", tasks_data)
 
 def display_tasks():
     """Display all tasks."""
@@ -45,14 +71,11 @@ def display_tasks():
     table.add_column("Time (min)", style="bold #FC6C85")
     table.add_column("Status", style="bold #FC6C85")
     table.add_column("Recurrence", style="bold #FC6C85")
+    table.add_column("Deadline", style="bold #FC6C85")
 
     for i, task in enumerate(tasks_data):
-        title = task.get("title", "Untitled")
-        day = task.get("day", "Unassigned").capitalize()
-        time = str(task.get("time", "N/A"))
-        status = "Scheduled" if task.get("scheduled", False) else ("Done" if task.get("done") else "Not Done")
-        recurrence = task.get("recurrence", "None").capitalize()
-        table.add_row(str(i), title, day, time, status, recurrence)
+        status = "Scheduled" if task.scheduled else ("Done" if task.done else "Not Done")
+        table.add_row(str(i), task.title, task.day.capitalize(), str(task.time), status, task.recurrence.capitalize(), task.deadline or "")
 
     console.print(table)
 
@@ -63,13 +86,22 @@ def add_task():
     day = console.input("[#FC6C85]Day of the week (e.g., Monday): [/#FC6C85]").strip().lower()
     time = console.input("[#FC6C85]Time required (in minutes): [/#FC6C85]").strip()
     recurrence = console.input("[#FC6C85]Recurrence (none, daily, weekly): [/#FC6C85]").strip().lower() or "none"
-    if day not in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"] and day != "":
+    deadline = console.input("[#FC6C85]Linked deadline name (leave empty for none): [/#FC6C85]").strip()
+    if day not in DAYS_OF_WEEK and day != "":
         console.print("[bold red]Invalid day! Please enter a valid day of the week.[/bold red]")
         return
-    tasks_data.append({"title": title, "day": day, "time": int(time), "done": False, "scheduled": False, "recurrence": recurrence})
+    if deadline and not deadline_exists(deadline):
+        console.print("[bold red]No deadline with that name! Add it under deadlines first.[/bold red]")
+        return
+    tasks_data.append(Task(title, day, int(time), recurrence=recurrence, deadline=deadline or None))
     save_tasks(tasks_data)
     console.print("[bold #FC6C85]Task added successfully![/bold #FC6C85]")
 
+def deadline_exists(name):
+    """Check that a deadline with this name is in deadlines.json."""
+    from deadlines.deadlines import load_deadlines
+    return any(deadline.name == name for deadline in load_deadlines())
+
 def modify_task():
     """Modify an existing task."""
     tasks_data = load_tasks()
@@ -77,17 +109,25 @@ def modify_task():
     try:
         task_id = int(console.input("[#FC6C85]Enter task ID to modify: [/#FC6C85]"))
         if 0 <= task_id < len(tasks_data):
-            title = console.input("[#FC6C85]New task title (leave empty to keep current): [/#FC6C85]") or tasks_data[task_id].get("title", "Untitled")
-            day = console.input("[#FC6C85]New day of the week (leave empty to keep current): [/#FC6C85]").strip().lower() or tasks_data[task_id].get("day", "unassigned")
-            time = console.input("[#FC6C85]New time required (in minutes) (leave empty to keep current): [/#FC6C85]").strip() or tasks_data[task_id].get("time", "N/A")
-            recurrence = console.input("[#FC6C85]New recurrence (none, daily, weekly) (leave empty to keep current): [/#FC6C85]").strip().lower() or tasks_data[task_id].get("recurrence", "none")
-            if day not in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"] and day != "":
+            task = tasks_data[task_id]
+            title = console.input("[#FC6C85]New task title (leave empty to keep current): [/#FC6C85]") or task.title
+            day = console.input("[#FC6C85]New day of the week (leave empty to keep current): [/#FC6C85]").strip().lower() or task.day
+            time = console.input("[#FC6C85]New time required (in minutes) (leave empty to keep current): [/#FC6C85]").strip() or task.time
+            recurrence = console.input("[#FC6C85]New recurrence (none, daily, weekly) (leave empty to keep current): [/#FC6C85]").strip().lower() or task.recurrence
+            deadline = console.input("[#FC6C85]New linked deadline (leave empty to keep current, 'none' to unlink): [/#FC6C85]").strip() or task.deadline or ""
+            if day not in DAYS_OF_WEEK and day != "":
                 console.print("[bold red]Invalid day! Please enter a valid day of the week.[/bold red]")
                 return
-            tasks_data[task_id]["title"] = title
-            tasks_data[task_id]["day"] = day
-            tasks_data[task_id]["time"] = int(time)
-            tasks_data[task_id]["recurrence"] = recurrence
+            if deadline.lower() == "none":
+                deadline = ""
+            if deadline and not deadline_exists(deadline):
+                console.print("[bold red]No deadline with that name! Add it under deadlines first.[/bold red]")
+                return
+            task.time = int(time)
+            task.title = title
+            task.day = day
+            task.recurrence = recurrence
+            task.deadline = deadline or None
             save_tasks(tasks_data)
             console.print("[bold #FC6C85]Task modified successfully![/bold #FC6C85]")
         else:
@@ -95,6 +135,19 @@ def modify_task():
     except ValueError:
         console.print("[bold red]Invalid input! Please enter a valid task ID.[/bold red]")
 
+def complete_task(tasks_data, task_id):
+    """Remove a finished task, queueing the next one if it recurs."""
+    task = tasks_data.pop(task_id)  # Remove the task from the list
+    if task.recurrence == "daily":
+        next_day = datetime.now() + timedelta(days=1)
+        day = next_day.strftime("%A").lower()
+        tasks_data.append(Task(task.title, day, task.time, recurrence="daily"))
+    elif task.recurrence == "weekly":
+        next_week = datetime.now() + timedelta(days=7)
+        day = next_week.strftime("%A").lower()
+        tasks_data.append(Task(task.title, day, task.time, recurrence="weekly"))
+    return task
+
 def mark_task_done():
     """Mark a task as done."""
     tasks_data = load_tasks()
@@ -102,17 +155,7 @@ def mark_task_done():
     try:
         task_id = int(console.input("[#FC6C85]Enter task ID to mark as done: [/#FC6C85]"))
         if 0 <= task_id < len(tasks_data):
-            task = tasks_data.pop(task_id)  # Remove the task from the list
-            if task.get("recurrence") == "daily":
-                next_day = datetime.now() + timedelta(days=1)
-                day = next_day.strftime("%A").lower()
-                new_task = {"title": task["title"], "day": day, "time": task["time"], "done": False, "scheduled": False, "recurrence": "daily"}
-                tasks_data.append(new_task)
-            elif task.get("recurrence") == "weekly":
-                next_week = datetime.now() + timedelta(days=7)
-                day = next_week.strftime("%A").lower()
-                new_task = {"title": task["title"], "day": day, "time": task["time"], "done": False, "scheduled": False, "recurrence": "weekly"}
-                tasks_data.append(new_task)
+            complete_task(tasks_data, task_id)
             save_tasks(tasks_data)
             console.print("[bold #FC6C85]Task marked as done and handled successfully![/bold #FC6C85]")
         else:
@@ -122,10 +165,10 @@ def mark_task_done():
 
 def delete_task():
     """Delete an existing task and remove it from the calendar if scheduled."""
-    from my_calendar.my_calendar import load_calendar, save_calendar  # Local import to avoid circular dependency
+    from my_calendar.my_calendar import load_event_ids, save_calendar  # Local import to avoid circular dependency
 
     tasks_data = load_tasks()
-    calendar_data = load_calendar()
+    event_ids = load_event_ids()
     display_tasks()
 
     try:
@@ -133,39 +176,38 @@ def delete_task():
         if 0 <= task_id < len(tasks_data):
             task = tasks_data.pop(task_id)  # Remove the task from the list
 
-            # Remove the task from the calendar if it is scheduled
-            for event in calendar_data[:]:
-                if event["title"] == task["title"]:
-                    calendar_data.remove(event)
-
-            save_calendar(calendar_data)
+            # Remove the events the task was scheduled into, or for a task with
+            # none linked, the unlinked events with its title
+            if event_ids.remove_task(task.id) or (task.scheduled and event_ids.remove_unlinked(task.title)):
+                save_calendar(event_ids.calendar_data, event_ids)
             save_tasks(tasks_data)
-            console.print(f"[bold #FC6C85]Task '{task['title']}' deleted successfully![/bold #FC6C85]")
+            console.print(f"[bold #FC6C85]Task '{task.title}' deleted successfully![/bold #FC6C85]")
         else:
             console.print("[bold red]Invalid task ID! Please enter a valid task ID.[/bold red]")
     except ValueError:
         console.print("[bold red]Invalid input! Please enter a valid task ID.[/bold red]")
 def schedule_task():
     """Schedule or reschedule a task in the calendar."""
-    from my_calendar.my_calendar import load_calendar, save_calendar  # Local import to avoid circular dependency
+    from my_calendar.my_calendar import load_event_ids, save_calendar  # Local import to avoid circular dependency
+    from my_calendar.event_index import EventIndex
+    from my_calendar.models import Event
+    from my_calendar.availability import Availability, DEFAULT_HORIZON_DAYS
+    from tasks.scheduler import deadline_dates
+    from deadlines.deadlines import load_deadlines
 
     tasks_data = load_tasks()
-    calendar_data = load_calendar()
+    event_ids = load_event_ids()
+    calendar_data = event_ids.calendar_data
     display_tasks()
 
     try:
         task_id = int(console.input("[#FC6C85]Enter task ID to schedule: [/#FC6C85]"))
         if 0 <= task_id < len(tasks_data):
             task = tasks_data[task_id]
-            title = task["title"]
-            day = task["day"].capitalize()
-            task_duration = timedelta(minutes=int(task["time"]))
-            recurrence = task["recurrence"]
-
-            # If the task is already scheduled, remove it from the calendar
-            for event in calendar_data[:]:
-                if event["title"] == title:
-                    calendar_data.remove(event)
+            title = task.title
+            day = task.day.capitalize()
+            task_duration = timedelta(minutes=task.time)
+            recurrence = task.recurrence
 
             specified_time = console.input("[#FC6C85]Enter specific time to schedule (e.g., 2:30 PM) or leave empty for auto-schedule: [/#FC6C85]").strip()
             if specified_time:
@@ -179,6 +221,10 @@ def schedule_task():
 
             days_of_week = {"Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6}
             if day in days_of_week:
+                # If the task is already scheduled, remove it from the calendar
+                if not event_ids.remove_task(task.id) and task.scheduled:
+                    event_ids.remove_unlinked(title)
+
                 today = datetime.now().date()
                 current_weekday = today.weekday()
                 task_day_offset = days_of_week[day] - current_weekday
@@ -196,39 +242,28 @@ def schedule_task():
                     if start_time < datetime.now():
                         start_time = datetime.now() + timedelta(minutes=1)
 
-                # Align the start_time to the start of a 30-minute block
-                start_time = start_time.replace(minute=(start_time.minute // 30) * 30, second=0, microsecond=0)
-
-                while start_time.hour < 23:
-                    block_end_time = start_time + timedelta(minutes=30)
-
-                    # Check for overlap with existing events
-                    conflict = False
-                    for event in calendar_data:
-                        if (event["start_time"] < block_end_time and event["end_time"] > start_time):
-                            conflict = True
-                            break
-
-                    if not conflict:
-                        # Schedule the task in the current block
-                        calendar_data.append({
-                            "title": title,
-                            "start_time": start_time,
-                            "end_time": start_time + task_duration,
-                            "recurrence": recurrence,
-                            "completed": False
-                        })
-                        console.print(f"[bold #FC6C85]Task '{title}' scheduled successfully at {start_time.strftime('%I:%M %p')}![/bold #FC6C85]")
-                        break
-                    else:
-                        # Move to the next available 30-minute block
-                        start_time += timedelta(minutes=30)
-
+                # Find the first gap that fits the whole task, looking ahead up to a
+                # week or, for tasks linked to a deadline, until it is due
+                horizon_days, due = DEFAULT_HORIZON_DAYS, None
+                if task.deadline:
+                    due = deadline_dates(load_deadlines()).get(task.deadline)
+                    if due:
+                        horizon_days = max((due.date() - start_time.date()).days + 1, 0)
+                availability = Availability(EventIndex(calendar_data))
+                start_time = availability.find_slot(start_time, task_duration, horizon_days, latest=due)
+
+                if start_time:
+                    event_ids.add(Event(title, start_time, start_time + task_duration, recurrence, task_id=task.id))
+                    console.print(f"[bold #FC6C85]Task '{title}' scheduled successfully on {start_time.strftime('%A at %I:%M %p')}![/bold #FC6C85]")
+                    task.scheduled = True
+                elif due:
+                    console.print(f"[bold red]Could not find an available slot before '{task.deadline}' is due.[/bold red]")
+                    task.scheduled = False
                 else:
-                    console.print("[bold red]Could not find an available slot for scheduling today.[/bold red]")
+                    console.print(f"[bold red]Could not find an available slot in the next {DEFAULT_HORIZON_DAYS} days.[/bold red]")
+                    task.scheduled = False
 
-                save_calendar(calendar_data)
-                tasks_data[task_id]["scheduled"] = True
+                save_calendar(calendar_data, event_ids)
                 save_tasks(tasks_data)
             else:
                 console.print("[bold red]Invalid day! Please enter a valid day of the week.[/bold red]")
@@ -237,10 +272,43 @@ def schedule_task():
     except ValueError:
         console.print("[bold red]Invalid input! Please enter a valid task ID.[/bold red]")
 
+def schedule_all():
+    """Schedule every unscheduled task in one pass and report the ones that did not fit."""
+    from my_calendar.my_calendar import load_calendar, save_calendar  # Local import to avoid circular dependency
+    from tasks.scheduler import schedule_all_tasks
+    from deadlines.deadlines import load_deadlines
+
+    tasks_data = load_tasks()
+    calendar_data = load_calendar()
+    placed, unfit = schedule_all_tasks(tasks_data, calendar_data, load_deadlines())
+
+    if not placed and not unfit:
+        console.print("[bold #FC6C85]All tasks are already scheduled![/bold #FC6C85]")
+        return
+
+    if placed:
+        table = Table(title="Scheduled Tasks", show_header=True, header_style="bold magenta", show_lines=True)
+        table.add_column("Task", style="bold #FC6C85")
+        table.add_column("Day", style="bold #FC6C85")
+        table.add_column("Time", style="bold #FC6C85")
+        for task, chunks in placed:
+            for start_time, end_time in chunks:
+                table.add_row(task.title, start_time.strftime("%A %B %d"), f"{start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}")
+        console.print(table)
+        save_calendar(calendar_data)
+        save_tasks(tasks_data)
+
+    for task in unfit:
+        if task.deadline:
+            console.print(f"[bold red]Could not fit '{task.title}' ({task.time} min) before '{task.deadline}' is due.[/bold red]")
+        else:
+            console.print(f"[bold red]Could not fit '{task.title}' ({task.time} min) into the next week.[/bold red]")
+
 
 if __name__ == "__main__":
     while True:
-        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (display, add, modify, done, delete, schedule, exit)")
+        store.flush()  # Write whatever the last action changed
+        console.print("[bold #FC6C85]Options:[/bold #FC6C85] (display, add, modify, done, delete, schedule, schedule all, exit)")
         choice = console.input("[#FC6C85]Enter your choice: [/#FC6C85]").strip().lower()
         if choice == "display":
             display_tasks()
@@ -254,6 +322,8 @@ if __name__ == "__main__":
             delete_task()
         elif choice == "schedule":
             schedule_task()
+        elif choice == "schedule all":
+            schedule_all()
         elif choice == "exit":
             break
         else:
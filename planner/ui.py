@@ -0,0 +1,4 @@
+from rich.console import Console
+
+# The one console every module prints and prompts through
+console = Console()